@@ -54,11 +54,11 @@ def generate_example_prompt(generator: PromptGenerator, config: PromptConfig, ti
         title: Display title for the example.
     """
     logger.info(f"Generating prompt for: {title}")
-    prompt = generator.generate_prompt(config)
 
     separator = "-" * (len(title) + 8)
     print(f"\n--- {title} ---")
-    print(prompt)
+    sys.stdout.writelines(generator.stream_prompt(config))
+    print()
     print(separator)
 
 
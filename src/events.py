@@ -14,10 +14,11 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Type, Union
 from uuid import UUID, uuid4
 
 from .performance import performance_tracker
@@ -155,12 +156,19 @@ class EventBus:
     them to communicate through events rather than direct dependencies.
     """
 
-    def __init__(self):
+    def __init__(self, max_history_size: int = 1000):
+        """
+        Initialize the event bus.
+
+        Args:
+            max_history_size: Number of most recent events kept in history.
+        """
         self._handlers: Dict[EventType, List[EventHandler]] = {}
         self._sync_handlers: Dict[EventType, List[SyncEventHandler]] = {}
         self._global_handlers: List[EventHandler] = []
-        self._event_history: List[Event] = []
-        self._max_history_size = 1000
+        # Bounded ring buffer: appends evict the oldest event in O(1)
+        self._event_history: Deque[Event] = deque(maxlen=max_history_size)
+        self._max_history_size = max_history_size
 
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """
@@ -205,10 +213,8 @@ class EventBus:
         Args:
             event: Event to publish.
         """
-        # Add to history
+        # Add to history (deque evicts the oldest event once full)
         self._event_history.append(event)
-        if len(self._event_history) > self._max_history_size:
-            self._event_history.pop(0)
 
         logger.debug(f"Publishing event: {event.event_type.value} from {event.source}")
 
@@ -237,6 +243,50 @@ class EventBus:
                 except Exception as e:
                     logger.error(f"Error in sync event handler: {e}")
 
+    async def publish_many(self, events: Iterable[Event]) -> None:
+        """
+        Publish a batch of events with a single handler dispatch.
+
+        Handler lists are resolved once per event type, history is extended in
+        one call and all async handler invocations share one gather, avoiding
+        the per-event overhead of repeated publish calls.
+
+        Args:
+            events: Events to publish, in order.
+        """
+        events = list(events)
+        if not events:
+            return
+
+        # Add to history (deque keeps only the most recent events)
+        self._event_history.extend(events)
+
+        logger.debug(f"Publishing batch of {len(events)} events")
+
+        handlers_by_type: Dict[EventType, List[EventHandler]] = {}
+        coroutines = []
+        for event in events:
+            handlers = handlers_by_type.get(event.event_type)
+            if handlers is None:
+                handlers = self._handlers.get(event.event_type, []) + self._global_handlers
+                handlers_by_type[event.event_type] = handlers
+            coroutines.extend(handler(event) for handler in handlers)
+
+        # Run async handlers concurrently
+        if coroutines:
+            try:
+                await asyncio.gather(*coroutines)
+            except Exception as e:
+                logger.error(f"Error in async event handler: {e}")
+
+        # Run sync handlers
+        for event in events:
+            for handler in self._sync_handlers.get(event.event_type, ()):
+                try:
+                    handler(event)
+                except Exception as e:
+                    logger.error(f"Error in sync event handler: {e}")
+
     def get_event_history(self, event_type: Optional[EventType] = None) -> List[Event]:
         """
         Get event history, optionally filtered by type.
@@ -248,14 +298,21 @@ class EventBus:
             List of events from history.
         """
         if event_type is None:
-            return self._event_history.copy()
+            return list(self._event_history)
 
-        return [event for event in self._event_history if event.event_type == event_type]
+        return [event for event in self._event_history if event.event_type is event_type]
 
     def clear_history(self) -> None:
         """Clear event history."""
         self._event_history.clear()
 
+    def reset(self) -> None:
+        """Remove all subscribed handlers and clear event history."""
+        self._handlers.clear()
+        self._sync_handlers.clear()
+        self._global_handlers.clear()
+        self._event_history.clear()
+
     def unsubscribe(
         self, event_type: EventType, handler: Union[EventHandler, SyncEventHandler]
     ) -> bool:
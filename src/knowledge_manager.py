@@ -1,11 +1,79 @@
+import copy
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.utils import load_json_file, read_text_file, safe_path_join
 
 logger = logging.getLogger(__name__)
 
+# Knowledge base reads are blocking IO, so a small thread pool overlaps them
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 1) * 2), thread_name_prefix="kb-loader"
+)
+
+
+@lru_cache(maxsize=256)
+def _load_kb_file(loader: Callable[[str], Any], filepath: str, mtime_ns: int) -> Any:
+    """
+    Loads a knowledge base file once per (loader, path, modification time).
+
+    Shared across KnowledgeManager instances so a new manager over the same
+    knowledge base reuses already parsed files; a changed mtime forces a reload.
+    The returned object is shared too, so callers go through _load_cached,
+    which copies it.
+
+    Args:
+        loader: Function reading the file (read_text_file or load_json_file).
+        filepath: The absolute path to the file.
+        mtime_ns: The file's modification time in nanoseconds, part of the cache key.
+
+    Returns:
+        The loaded file content.
+    """
+    return loader(filepath)
+
+
+def _summarize_markdown(text: str) -> str:
+    """
+    Extracts the title line and the first paragraph line from a markdown document.
+
+    Args:
+        text: The markdown content.
+
+    Returns:
+        The title and summary joined by a newline, or just the title if there is no body.
+    """
+    lines = text.strip().splitlines()
+    if not lines:
+        return ""
+    title = lines[0].strip()
+    summary = next((line.strip() for line in lines[1:] if line.strip()), "")
+    return f"{title}\n{summary}" if summary else title
+
+
+def _load_cached(loader: Callable[[str], Any], filepath: str) -> Any:
+    """
+    Loads a knowledge base file through the shared cache when it can be stat'ed.
+
+    Args:
+        loader: Function reading the file (read_text_file or load_json_file).
+        filepath: The absolute path to the file.
+
+    Returns:
+        The loaded file content, private to the caller.
+    """
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
+        # Let the loader raise and log the usual error for missing files
+        return loader(filepath)
+    content = _load_kb_file(loader, filepath, mtime_ns)
+    # Parsed JSON is mutable; copy it so one manager's changes stay its own
+    return content if isinstance(content, str) else copy.deepcopy(content)
+
 
 class KnowledgeManager:
     """
@@ -27,7 +95,8 @@ class KnowledgeManager:
         self.knowledge_base_root: str = (
             base_path if base_path else os.path.dirname(os.path.dirname(config_path))
         )
-        self._cache: Dict[str, Any] = {}
+        # Keyed by (kind, name) so repeated lookups skip path resolution entirely
+        self._cache: Dict[Tuple[str, str], Any] = {}
 
     def _load_tech_stack_mapping(self) -> Dict[str, Any]:
         """
@@ -37,7 +106,8 @@ class KnowledgeManager:
             A dictionary containing the tech stack mapping.
         """
         try:
-            return load_json_file(self.config_path)
+            # Parsed once per file version and shared by every manager over it
+            return _load_cached(load_json_file, self.config_path)
         except (FileNotFoundError, ValueError, IOError) as e:
             logger.error(f"Failed to load tech stack mapping from {self.config_path}: {e}")
             # Depending on criticality, might re-raise or return an empty dict
@@ -78,18 +148,15 @@ class KnowledgeManager:
         Returns:
             The content of the best practice file as a string, or None if not found or an error occurs.
         """
-        # Normalize name to match filename convention (lowercase, underscores)
-        filename = f"{bp_name.lower().replace(' ', '_')}.md"
-        filepath = safe_path_join(
-            self.knowledge_base_root, "knowledge_base", "best_practices", filename
-        )
+        cache_key = ("best_practice", bp_name)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
 
-        if filepath in self._cache:
-            return self._cache[filepath]
+        filepath = self._best_practice_path(bp_name)
 
         try:
-            content = read_text_file(filepath)
-            self._cache[filepath] = content
+            content = _load_cached(read_text_file, filepath)
+            self._cache[cache_key] = content
             return content
         except (FileNotFoundError, ValueError, IOError) as e:
             logger.warning(
@@ -97,6 +164,30 @@ class KnowledgeManager:
             )
             return None
 
+    def get_best_practice_summary(self, bp_name: str) -> Optional[str]:
+        """
+        Retrieves the title and first paragraph line of a best practice.
+
+        Derived from the cached full content, so it costs no extra file read.
+
+        Args:
+            bp_name: The name of the best practice (e.g., "PEP8", "Clean Code Principles").
+
+        Returns:
+            The short summary as a string, or None if the best practice cannot be loaded.
+        """
+        cache_key = ("best_practice_summary", bp_name)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        details = self.get_best_practice_details(bp_name)
+        if details is None:
+            return None
+
+        summary = _summarize_markdown(details)
+        self._cache[cache_key] = summary
+        return summary
+
     def get_tool_details(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves the detailed information of a specific tool from the knowledge base.
@@ -115,18 +206,98 @@ class KnowledgeManager:
         
         # Ensure we have a string for filename operations
         tool_name_str = str(tool_name)
-        
-        # Normalize name to match filename convention (lowercase, underscores)
-        filename = f"{tool_name_str.lower().replace(' ', '_')}.json"
-        filepath = safe_path_join(self.knowledge_base_root, "knowledge_base", "tools", filename)
 
-        if filepath in self._cache:
-            return self._cache[filepath]
+        cache_key = ("tool", tool_name_str)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+        
+        filepath = self._tool_path(tool_name_str)
 
         try:
-            content = load_json_file(filepath)
-            self._cache[filepath] = content
+            content = _load_cached(load_json_file, filepath)
+            self._cache[cache_key] = content
             return content
         except (FileNotFoundError, ValueError, IOError) as e:
             logger.warning(f"Could not load tool details for '{tool_name}' from {filepath}: {e}")
             return None
+
+    def _best_practice_path(self, bp_name: str) -> str:
+        """
+        Resolves the knowledge base file holding a best practice.
+
+        Args:
+            bp_name: The name of the best practice.
+
+        Returns:
+            The absolute path to the best practice markdown file.
+
+        Raises:
+            ValueError: If the name would resolve outside the knowledge base.
+        """
+        # Normalize name to match filename convention (lowercase, underscores)
+        filename = f"{bp_name.lower().replace(' ', '_')}.md"
+        return safe_path_join(
+            self.knowledge_base_root, "knowledge_base", "best_practices", filename
+        )
+
+    def _tool_path(self, tool_name: str) -> str:
+        """
+        Resolves the knowledge base file holding a tool.
+
+        Args:
+            tool_name: The name of the tool.
+
+        Returns:
+            The absolute path to the tool JSON file.
+
+        Raises:
+            ValueError: If the name would resolve outside the knowledge base.
+        """
+        # Normalize name to match filename convention (lowercase, underscores)
+        filename = f"{tool_name.lower().replace(' ', '_')}.json"
+        return safe_path_join(self.knowledge_base_root, "knowledge_base", "tools", filename)
+
+    def preload(self, best_practices: Iterable[str], tools: Iterable[Any]) -> None:
+        """
+        Reads the files of several best practices and tools concurrently.
+
+        The files are parsed into the shared file cache, so the regular lookups
+        that follow are served without touching the disk again. Items already in
+        the cache are skipped, so a warm manager never touches the thread pool.
+        Missing files are skipped without a read, leaving the regular lookup to
+        read them once and report the error.
+
+        Args:
+            best_practices: Names of the best practices to load.
+            tools: Names of the tools to load.
+        """
+        pending: List[Tuple[Callable[[str], Any], Callable[[str], str], str]] = [
+            (read_text_file, self._best_practice_path, name)
+            for name in best_practices
+            if ("best_practice", name) not in self._cache
+        ]
+        pending.extend(
+            (load_json_file, self._tool_path, str(name))
+            for name in tools
+            if not isinstance(name, dict) and ("tool", str(name)) not in self._cache
+        )
+        if len(pending) < 2:
+            # Nothing to overlap; the regular lookup loads it just as fast
+            return
+
+        list(_EXECUTOR.map(_preload_file, pending))
+
+
+def _preload_file(item: Tuple[Callable[[str], Any], Callable[[str], str], str]) -> None:
+    """Parses one knowledge base file into the shared cache if it exists."""
+    loader, resolve_path, name = item
+    try:
+        filepath = resolve_path(name)
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except (ValueError, OSError):
+        # Outside the knowledge base or missing; the regular lookup reports it
+        return
+    try:
+        _load_kb_file(loader, filepath, mtime_ns)
+    except (ValueError, IOError):
+        pass
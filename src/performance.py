@@ -9,17 +9,24 @@ while async I/O provides better resource utilization and scalability.
 """
 
 import asyncio
+import json
 import logging
 import time
 import tracemalloc
+from collections import deque
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
-from typing import Any, AsyncContextManager, Callable, Dict, Optional, TypeVar, Union
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, List, Optional, TypeVar, Union
 
 import aiofiles
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 from .result_types import Error, KnowledgeError, Success
 
 logger = logging.getLogger(__name__)
@@ -27,6 +34,15 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 F = TypeVar("F", bound=Callable[..., Any])
 
+# orjson raises a json.JSONDecodeError subclass, so callers handle both alike
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Bound once at import so decorated hot paths skip the attribute lookup
+_pc = time.perf_counter_ns
+
+# Number of recent durations retained per operation
+DURATION_HISTORY_SIZE = 1024
+
 
 @dataclass
 class PerformanceMetrics:
@@ -64,6 +80,7 @@ class PerformanceTracker:
 
     def __init__(self):
         self._metrics: Dict[str, PerformanceMetrics] = {}
+        self._durations: Dict[str, Deque[int]] = {}
         self._memory_baseline = 0
 
     def start_tracking(self, operation: str) -> str:
@@ -77,16 +94,29 @@ class PerformanceTracker:
         )
         return operation
 
-    def stop_tracking(self, operation: str) -> PerformanceMetrics:
-        """Stop tracking and return metrics."""
+    def stop_tracking(
+        self, operation: str, duration_ns: Optional[int] = None
+    ) -> PerformanceMetrics:
+        """
+        Stop tracking and return metrics.
+
+        Args:
+            operation: Name of the tracked operation.
+            duration_ns: Execution time already measured by the caller, in
+                nanoseconds. Measured from the metrics' start time when omitted.
+        """
         if operation not in self._metrics:
             raise ValueError(f"No tracking started for operation: {operation}")
 
         metrics = self._metrics[operation]
-        metrics.execution_time = time.perf_counter() - metrics.start_time
+        if duration_ns is None:
+            metrics.execution_time = time.perf_counter() - metrics.start_time
+        else:
+            metrics.execution_time = duration_ns / 1e9
         metrics.memory_usage_mb = self._get_memory_usage() - metrics.memory_usage_mb
 
-        logger.info(f"Performance metrics: {metrics.to_dict()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Performance metrics: {metrics.to_dict()}")
         return metrics
 
     def record_cache_hit(self, operation: str) -> None:
@@ -109,6 +139,33 @@ class PerformanceTracker:
         if operation in self._metrics:
             self._metrics[operation].error_count += 1
 
+    def duration_history(self, operation: str) -> Deque[int]:
+        """
+        Get the bounded duration history (in nanoseconds) for an operation.
+
+        The deque is created on first use and kept for the tracker's lifetime,
+        so callers may hold on to it; reset() empties it in place.
+        """
+        durations = self._durations.get(operation)
+        if durations is None:
+            durations = self._durations[operation] = deque(maxlen=DURATION_HISTORY_SIZE)
+        return durations
+
+    def record_duration(self, operation: str, duration_ns: int) -> None:
+        """Record a completed call duration in nanoseconds (bounded history)."""
+        self.duration_history(operation).append(duration_ns)
+
+    def get_recent_durations(self, operation: str) -> List[float]:
+        """Get recently recorded durations for an operation in seconds."""
+        return [duration_ns / 1e9 for duration_ns in self._durations.get(operation, ())]
+
+    def reset(self) -> None:
+        """Discard all tracked operation metrics."""
+        self._metrics.clear()
+        for durations in self._durations.values():
+            durations.clear()
+        self._memory_baseline = 0
+
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB."""
         if tracemalloc.is_tracing():
@@ -131,12 +188,15 @@ def monitor_performance(operation_name: Optional[str] = None):
 
     def decorator(func: F) -> F:
         op_name = operation_name or func.__name__
+        # Resolved once per decorated function so each call is a bare append
+        record_duration = performance_tracker.duration_history(op_name).append
 
         if asyncio.iscoroutinefunction(func):
 
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
                 performance_tracker.start_tracking(op_name)
+                start_ns = _pc()
                 try:
                     result = await func(*args, **kwargs)
                     return result
@@ -144,7 +204,9 @@ def monitor_performance(operation_name: Optional[str] = None):
                     performance_tracker.record_error(op_name)
                     raise
                 finally:
-                    performance_tracker.stop_tracking(op_name)
+                    duration_ns = _pc() - start_ns
+                    performance_tracker.stop_tracking(op_name, duration_ns)
+                    record_duration(duration_ns)
 
             return async_wrapper  # type: ignore
         else:
@@ -152,6 +214,7 @@ def monitor_performance(operation_name: Optional[str] = None):
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
                 performance_tracker.start_tracking(op_name)
+                start_ns = _pc()
                 try:
                     result = func(*args, **kwargs)
                     return result
@@ -159,7 +222,9 @@ def monitor_performance(operation_name: Optional[str] = None):
                     performance_tracker.record_error(op_name)
                     raise
                 finally:
-                    performance_tracker.stop_tracking(op_name)
+                    duration_ns = _pc() - start_ns
+                    performance_tracker.stop_tracking(op_name, duration_ns)
+                    record_duration(duration_ns)
 
             return sync_wrapper  # type: ignore
 
@@ -256,8 +321,6 @@ async def async_load_json_file(filepath: str):
     Returns:
         Result containing parsed JSON data or error details.
     """
-    import json
-
     try:
         performance_tracker.record_io_operation("async_load_json_file")
 
@@ -270,7 +333,7 @@ async def async_load_json_file(filepath: str):
 
         # Parse JSON in executor to avoid blocking event loop
         loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, json.loads, content)
+        data = await loop.run_in_executor(None, _json_loads, content)
 
         logger.debug(f"Successfully loaded JSON from {filepath}")
         return Success(data)
@@ -12,14 +12,21 @@ import asyncio
 import logging
 import time
 import tracemalloc
-from contextlib import asynccontextmanager, contextmanager
+from bisect import bisect_left, insort
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, DefaultDict, Deque, Dict, List, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
+# Number of most recent response times that percentiles are computed over
+PERCENTILE_WINDOW_SIZE = 100
+
+# Clock used for all gate timings; looked up at call time so tests can replace it
+_clock = time.perf_counter
+
 
 class PerformanceViolationType(Enum):
     """Types of performance violations."""
@@ -35,12 +42,24 @@ class PerformanceViolationType(Enum):
 class PerformanceThreshold:
     """Performance threshold definition."""
 
+    # Declared by hand because dataclass(slots=True) needs Python 3.10
+    __slots__ = ("name", "value", "unit", "violation_type", "description")
+
     name: str
     value: float
     unit: str
     violation_type: PerformanceViolationType
     description: str
 
+    def __getstate__(self) -> tuple:
+        """Return field values in slot order for pickling and copying."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        """Restore field values; frozen instances reject regular setattr."""
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 @dataclass
 class PerformanceViolation(Exception):
@@ -136,9 +155,17 @@ class PerformanceGate:
             self.thresholds.update(custom_thresholds)
 
         self.violations: list[PerformanceViolation] = []
+        # Summary entries grouped by violation type, maintained as violations are recorded
+        self._violations_by_type: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
         self._response_times: list[float] = []
+        # Rolling percentile window, kept in arrival order and in sorted order
+        self._recent_times: Deque[float] = deque()
+        self._recent_times_sorted: list[float] = []
+        self._percentile_cache: Dict[str, float] = {}
+        self._percentile_cache_size = 0
         self._memory_baseline: Optional[float] = None
         self._memory_start_time: Optional[float] = None
+        self._memory_tracking_warned = False
 
         if not tracemalloc.is_tracing():
             tracemalloc.start()
@@ -154,14 +181,50 @@ class PerformanceGate:
         else:
             return sample_size - 1
 
+    def _record_response_times(self, durations_ms: Sequence[float]) -> None:
+        """
+        Record response times and update the sorted percentile window.
+
+        Each sample is inserted in sorted position and the oldest sample is
+        evicted once the window is full, so percentiles never need a full sort.
+        """
+        self._response_times.extend(durations_ms)
+        if len(durations_ms) >= PERCENTILE_WINDOW_SIZE:
+            # The batch replaces the whole window; rebuild it in one sort
+            self._recent_times = deque(durations_ms[-PERCENTILE_WINDOW_SIZE:])
+            self._recent_times_sorted = sorted(self._recent_times)
+            return
+
+        recent, recent_sorted = self._recent_times, self._recent_times_sorted
+        for duration_ms in durations_ms:
+            recent.append(duration_ms)
+            insort(recent_sorted, duration_ms)
+            if len(recent) > PERCENTILE_WINDOW_SIZE:
+                del recent_sorted[bisect_left(recent_sorted, recent.popleft())]
+
     def _calculate_current_percentile(self, percentile: str) -> Optional[float]:
-        """Calculate current percentile from response time samples."""
-        if len(self._response_times) < 20:  # Need sufficient samples
+        """
+        Calculate current percentile from response time samples.
+
+        Results are cached per percentile and only recomputed once new samples
+        have been recorded; a recomputation is a single index into the sorted
+        window.
+        """
+        sample_count = len(self._response_times)
+        if sample_count < 20:  # Need sufficient samples
             return None
 
-        sorted_times = sorted(self._response_times[-100:])  # Use last 100 samples
+        if self._percentile_cache_size != sample_count:
+            self._percentile_cache.clear()
+            self._percentile_cache_size = sample_count
+        elif percentile in self._percentile_cache:
+            return self._percentile_cache[percentile]
+
+        sorted_times = self._recent_times_sorted
         index = self._get_percentile_index(percentile, len(sorted_times))
-        return sorted_times[min(index, len(sorted_times) - 1)]
+        value = float(sorted_times[min(index, len(sorted_times) - 1)])
+        self._percentile_cache[percentile] = value
+        return value
 
     def _create_percentile_violation(
         self,
@@ -202,16 +265,17 @@ class PerformanceGate:
         Raises:
             PerformanceViolation: If threshold is exceeded and enforcement is enabled.
         """
-        threshold_key = f"api_response_{percentile}"
+        self._check_api_response(f"api_response_{percentile}", duration_ms, percentile)
 
-        if threshold_key not in self.thresholds:
+    def _check_api_response(self, threshold_key: str, duration_ms: float, percentile: str) -> None:
+        """Check a response time against the threshold stored under a preformatted key."""
+        threshold = self.thresholds.get(threshold_key)
+        if threshold is None:
             logger.warning(f"Unknown percentile threshold: {percentile}")
             return
 
-        threshold = self.thresholds[threshold_key]
-
         # Record response time for percentile calculation
-        self._response_times.append(duration_ms)
+        self._record_response_times((duration_ms,))
 
         # Calculate and check current percentile
         current_percentile = self._calculate_current_percentile(percentile)
@@ -221,13 +285,56 @@ class PerformanceGate:
                 current_percentile,
                 duration_ms,
                 percentile,
-                len(self._response_times[-100:]),
+                len(self._recent_times_sorted),
             )
             self._handle_violation(violation)
 
         # Check individual request against threshold
         self._check_individual_threshold(duration_ms, threshold, percentile)
 
+    def check_api_response_times_bulk(
+        self, durations_ms: Sequence[float], percentile: str = "p95"
+    ) -> None:
+        """
+        Check a batch of API response times against thresholds.
+
+        Records all samples first and evaluates the percentile once for the
+        whole batch, instead of once per sample as check_api_response_time does.
+
+        Args:
+            durations_ms: Response times in milliseconds.
+            percentile: Percentile to check against ("p95" or "p99").
+
+        Raises:
+            PerformanceViolation: If threshold is exceeded and enforcement is enabled.
+        """
+        threshold_key = f"api_response_{percentile}"
+
+        if threshold_key not in self.thresholds:
+            logger.warning(f"Unknown percentile threshold: {percentile}")
+            return
+
+        if not durations_ms:
+            return
+
+        threshold = self.thresholds[threshold_key]
+
+        self._record_response_times(durations_ms)
+
+        current_percentile = self._calculate_current_percentile(percentile)
+        if current_percentile and current_percentile > threshold.value:
+            violation = self._create_percentile_violation(
+                threshold,
+                current_percentile,
+                durations_ms[-1],
+                percentile,
+                len(self._recent_times_sorted),
+            )
+            self._handle_violation(violation)
+
+        for duration_ms in durations_ms:
+            self._check_individual_threshold(duration_ms, threshold, percentile)
+
     def check_memory_growth(self) -> None:
         """
         Check memory growth rate against threshold.
@@ -236,21 +343,27 @@ class PerformanceGate:
             PerformanceViolation: If memory growth exceeds 10% per hour.
         """
         if not tracemalloc.is_tracing():
-            logger.warning("Memory tracking not enabled, cannot check memory growth")
+            # Gate contexts call this on every monitored operation; warn once
+            if not self._memory_tracking_warned:
+                self._memory_tracking_warned = True
+                logger.warning("Memory tracking not enabled, cannot check memory growth")
             return
 
-        current_memory, _ = tracemalloc.get_traced_memory()
-        current_memory_mb = current_memory / 1024 / 1024
         current_time = time.time()
 
         if self._memory_baseline is None:
-            self._memory_baseline = current_memory_mb
+            current_memory, _ = tracemalloc.get_traced_memory()
+            self._memory_baseline = current_memory / 1024 / 1024
             self._memory_start_time = current_time
             return
 
         time_elapsed_hours = (current_time - self._memory_start_time) / 3600
 
-        if time_elapsed_hours > 0.1:  # Check after at least 6 minutes
+        # Growth is only evaluated after at least 6 minutes, so skip reading
+        # the traced memory until then
+        if time_elapsed_hours > 0.1:
+            current_memory, _ = tracemalloc.get_traced_memory()
+            current_memory_mb = current_memory / 1024 / 1024
             memory_growth = (
                 (current_memory_mb - self._memory_baseline) / self._memory_baseline
             ) * 100
@@ -295,6 +408,73 @@ class PerformanceGate:
 
                 self._handle_violation(violation)
 
+    def check_database_query_times_bulk(
+        self, durations_ms: Sequence[float], query_type: str = "simple"
+    ) -> None:
+        """
+        Check a batch of database query times against threshold.
+
+        Filters the batch in one pass and records a violation for every query
+        over the threshold before enforcing, instead of stopping at the first
+        one as repeated check_database_query_time calls would.
+
+        Args:
+            durations_ms: Query execution times in milliseconds.
+            query_type: Type of query ("simple" or "complex").
+
+        Raises:
+            PerformanceViolation: The first violation in the batch, if enforcement is enabled.
+        """
+        if query_type != "simple":
+            return
+
+        threshold = self.thresholds["db_query_simple"]
+        limit = threshold.value
+        violations = [
+            PerformanceViolation(
+                threshold=threshold,
+                actual_value=duration_ms,
+                context={"query_type": query_type, "duration_ms": duration_ms},
+            )
+            for duration_ms in durations_ms
+            if duration_ms > limit
+        ]
+        if violations:
+            self._handle_violations(violations)
+
+    def _record_violation(self, violation: PerformanceViolation) -> None:
+        """Store a violation and index its summary entry by violation type."""
+        self.violations.append(violation)
+        self._violations_by_type[violation.threshold.violation_type.value].append(
+            {
+                "threshold": violation.threshold.name,
+                "actual_value": violation.actual_value,
+                "expected_value": violation.threshold.value,
+                "timestamp": violation.timestamp,
+                "context": dict(violation.context),
+            }
+        )
+
+    def _handle_violations(self, violations: Sequence[PerformanceViolation]) -> None:
+        """
+        Handle several performance violations, recording all before enforcing.
+
+        Args:
+            violations: The performance violations that occurred, in order.
+
+        Raises:
+            PerformanceViolation: The first violation, if enforcement is enabled.
+        """
+        for violation in violations:
+            self._record_violation(violation)
+            logger.error(f"Performance violation detected: {violation}")
+
+        if self.enable_enforcement:
+            raise violations[0]
+
+        for violation in violations:
+            logger.warning(f"Performance violation ignored (enforcement disabled): {violation}")
+
     def _handle_violation(self, violation: PerformanceViolation) -> None:
         """
         Handle a performance violation.
@@ -305,7 +485,7 @@ class PerformanceGate:
         Raises:
             PerformanceViolation: If enforcement is enabled.
         """
-        self.violations.append(violation)
+        self._record_violation(violation)
 
         logger.error(f"Performance violation detected: {violation}")
 
@@ -314,6 +494,19 @@ class PerformanceGate:
         else:
             logger.warning(f"Performance violation ignored (enforcement disabled): {violation}")
 
+    def reset(self) -> None:
+        """Discard recorded violations, response times and memory tracking state."""
+        self.violations.clear()
+        self._violations_by_type.clear()
+        self._response_times.clear()
+        self._recent_times.clear()
+        self._recent_times_sorted.clear()
+        self._percentile_cache.clear()
+        self._percentile_cache_size = 0
+        self._memory_baseline = None
+        self._memory_start_time = None
+        self._memory_tracking_warned = False
+
     def get_violation_summary(self) -> Dict[str, Any]:
         """
         Get summary of all performance violations.
@@ -321,24 +514,12 @@ class PerformanceGate:
         Returns:
             Dictionary containing violation statistics.
         """
-        violations_by_type = {}
-        for violation in self.violations:
-            violation_type = violation.threshold.violation_type.value
-            if violation_type not in violations_by_type:
-                violations_by_type[violation_type] = []
-            violations_by_type[violation_type].append(
-                {
-                    "threshold": violation.threshold.name,
-                    "actual_value": violation.actual_value,
-                    "expected_value": violation.threshold.value,
-                    "timestamp": violation.timestamp,
-                    "context": violation.context,
-                }
-            )
-
         return {
             "total_violations": len(self.violations),
-            "violations_by_type": violations_by_type,
+            "violations_by_type": {
+                violation_type: list(entries)
+                for violation_type, entries in self._violations_by_type.items()
+            },
             "enforcement_enabled": self.enable_enforcement,
             "thresholds": {
                 k: {"name": v.name, "value": v.value, "unit": v.unit, "description": v.description}
@@ -358,35 +539,40 @@ def enforce_api_response_time(percentile: str = "p95"):
     """
     Decorator to automatically enforce API response time thresholds.
 
+    Only the threshold key is formatted here; the global gate and its threshold
+    are looked up on every call, so replacing the gate or its thresholds also
+    applies to functions decorated earlier.
+
     Args:
         percentile: Percentile to enforce ("p95" or "p99").
     """
+    threshold_key = f"api_response_{percentile}"
 
     def decorator(func):
         if asyncio.iscoroutinefunction(func):
 
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = _clock()
                 try:
-                    result = await func(*args, **kwargs)
-                    return result
+                    return await func(*args, **kwargs)
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-                    performance_gate.check_api_response_time(duration_ms, percentile)
+                    performance_gate._check_api_response(
+                        threshold_key, (_clock() - start_time) * 1000, percentile
+                    )
 
             return async_wrapper
         else:
 
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = _clock()
                 try:
-                    result = func(*args, **kwargs)
-                    return result
+                    return func(*args, **kwargs)
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-                    performance_gate.check_api_response_time(duration_ms, percentile)
+                    performance_gate._check_api_response(
+                        threshold_key, (_clock() - start_time) * 1000, percentile
+                    )
 
             return sync_wrapper
 
@@ -406,12 +592,12 @@ def enforce_database_query_time(query_type: str = "simple"):
 
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = _clock()
                 try:
                     result = await func(*args, **kwargs)
                     return result
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
+                    duration_ms = (_clock() - start_time) * 1000
                     performance_gate.check_database_query_time(duration_ms, query_type)
 
             return async_wrapper
@@ -419,12 +605,12 @@ def enforce_database_query_time(query_type: str = "simple"):
 
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = _clock()
                 try:
                     result = func(*args, **kwargs)
                     return result
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
+                    duration_ms = (_clock() - start_time) * 1000
                     performance_gate.check_database_query_time(duration_ms, query_type)
 
             return sync_wrapper
@@ -432,46 +618,75 @@ def enforce_database_query_time(query_type: str = "simple"):
     return decorator
 
 
-@contextmanager
-def performance_gate_context(check_memory: bool = True):
+class _GateContextBase:
     """
-    Context manager for performance gate monitoring.
+    Shared state for the performance gate context managers.
 
-    Args:
-        check_memory: Whether to check memory growth.
+    These are plain classes rather than @contextmanager generators, since the
+    enhanced monitoring wrappers enter one on every monitored call.
     """
-    start_time = time.perf_counter()
 
-    try:
-        yield performance_gate
-    finally:
-        if check_memory:
+    __slots__ = ("check_memory", "start_time")
+
+    def __init__(self, check_memory: bool):
+        self.check_memory = check_memory
+        self.start_time = 0.0
+
+    def _start(self) -> PerformanceGate:
+        self.start_time = _clock()
+        return performance_gate
+
+    def _finish(self, slow_message: str) -> None:
+        if self.check_memory:
             performance_gate.check_memory_growth()
 
-        duration_ms = (time.perf_counter() - start_time) * 1000
+        duration_ms = (_clock() - self.start_time) * 1000
         if duration_ms > 1000:  # Log slow operations
-            logger.warning(f"Slow operation detected: {duration_ms:.2f}ms")
+            logger.warning(f"{slow_message}: {duration_ms:.2f}ms")
+
+
+class _PerformanceGateContext(_GateContextBase):
+    """Sync performance gate context."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> PerformanceGate:
+        return self._start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._finish("Slow operation detected")
+
+
+class _AsyncPerformanceGateContext(_GateContextBase):
+    """Async performance gate context."""
 
+    __slots__ = ()
 
-@asynccontextmanager
-async def async_performance_gate_context(check_memory: bool = True):
+    async def __aenter__(self) -> PerformanceGate:
+        return self._start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._finish("Slow async operation detected")
+
+
+def performance_gate_context(check_memory: bool = True) -> _PerformanceGateContext:
     """
-    Async context manager for performance gate monitoring.
+    Context manager for performance gate monitoring.
 
     Args:
         check_memory: Whether to check memory growth.
     """
-    start_time = time.perf_counter()
+    return _PerformanceGateContext(check_memory)
 
-    try:
-        yield performance_gate
-    finally:
-        if check_memory:
-            performance_gate.check_memory_growth()
 
-        duration_ms = (time.perf_counter() - start_time) * 1000
-        if duration_ms > 1000:  # Log slow operations
-            logger.warning(f"Slow async operation detected: {duration_ms:.2f}ms")
+def async_performance_gate_context(check_memory: bool = True) -> _AsyncPerformanceGateContext:
+    """
+    Async context manager for performance gate monitoring.
+
+    Args:
+        check_memory: Whether to check memory growth.
+    """
+    return _AsyncPerformanceGateContext(check_memory)
 
 
 # Integration with existing performance monitoring
@@ -481,12 +696,12 @@ def _create_enhanced_async_wrapper(monitored_func, op_name: str):
     @wraps(monitored_func)
     async def async_wrapper(*args, **kwargs):
         async with async_performance_gate_context():
-            start_time = time.perf_counter()
+            start_time = _clock()
             try:
                 result = await monitored_func(*args, **kwargs)
                 return result
             finally:
-                duration_ms = (time.perf_counter() - start_time) * 1000
+                duration_ms = (_clock() - start_time) * 1000
                 performance_gate.check_api_response_time(duration_ms, "p95")
 
     return async_wrapper
@@ -498,12 +713,12 @@ def _create_enhanced_sync_wrapper(monitored_func, op_name: str):
     @wraps(monitored_func)
     def sync_wrapper(*args, **kwargs):
         with performance_gate_context():
-            start_time = time.perf_counter()
+            start_time = _clock()
             try:
                 result = monitored_func(*args, **kwargs)
                 return result
             finally:
-                duration_ms = (time.perf_counter() - start_time) * 1000
+                duration_ms = (_clock() - start_time) * 1000
                 performance_gate.check_api_response_time(duration_ms, "p95")
 
     return sync_wrapper
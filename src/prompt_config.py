@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 
 @dataclass
@@ -55,9 +55,11 @@ class PromptConfig:
     Why this approach: Using a configuration object with specific options
     allows for dynamic template generation with relevant examples based on
     exact technology stack requirements.
+
+    Technologies are stored as a tuple so they can be used directly in cache keys.
     """
 
-    technologies: List[str]
+    technologies: Sequence[str]
     task_type: str
     code_requirements: str
     task_description: str = ""
@@ -86,6 +88,8 @@ class PromptConfig:
         self.code_requirements = self.code_requirements.strip()
 
         # Validate technologies list contains only non-empty strings
-        self.technologies = [tech.strip().lower() for tech in self.technologies if tech.strip()]
+        self.technologies = tuple(
+            tech.strip().lower() for tech in self.technologies if tech.strip()
+        )
         if not self.technologies:
             raise ValueError("Technologies list cannot be empty after cleaning")
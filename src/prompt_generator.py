@@ -1,14 +1,128 @@
 import json
 import logging
-from typing import Any, Callable, Dict, List, Optional
-
-from jinja2 import Environment, FileSystemLoader
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    ChainableUndefined,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    Undefined,
+)
+from jinja2.sandbox import SandboxedEnvironment
 
 from src.knowledge_manager import KnowledgeManager
 from src.prompt_config import PromptConfig
 
 logger = logging.getLogger(__name__)
 
+GENERIC_TEMPLATE = "base_prompts/generic_code_prompt.txt"
+
+# Guideline partials selected per task type, included via {% include guidelines_template %}
+TASK_TYPE_TEMPLATES = {
+    "feature implementation": "guidelines/feature.txt",
+    "bug fix": "guidelines/bugfix.txt",
+}
+GENERIC_GUIDELINES_TEMPLATE = "guidelines/generic.txt"
+
+# Invariant text blocks exposed to every template as globals, built once at import
+TEMPLATE_SNIPPETS = {
+    "checklist": "\n".join(f"{i}. Step {i} of implementation" for i in range(1, 6)),
+}
+
+# Upper bound on rendered prompts kept per generator
+PROMPT_CACHE_SIZE = 256
+
+# Compiled templates persist here between processes; an empty value disables it
+BYTECODE_CACHE_ENV = "PROMPT_ENG_JINJA_CACHE"
+DEFAULT_BYTECODE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "prompteng", "jinja")
+
+
+def _create_environment(
+    loader: BaseLoader,
+    bytecode_cache: Optional[BytecodeCache] = None,
+    sandboxed: bool = False,
+) -> Environment:
+    """
+    Creates a Jinja2 environment with the custom filters used by prompt templates.
+
+    Args:
+        loader: Template loader backing the environment.
+        bytecode_cache: Optional cache persisting compiled templates between environments.
+        sandboxed: Whether to render through a SandboxedEnvironment, which raises
+            SecurityError on unsafe attribute access from template code.
+
+    Returns:
+        The configured Jinja2 environment.
+
+    Note:
+        auto_reload is disabled so cached templates are served without a source
+        stat per render; edits to template files need a fresh process (or
+        _get_shared_environment.cache_clear()) to be picked up.
+
+        Prompts are plain text, so autoescaping is off.
+        Missing variables chain (``{{ missing.key | default(...) }}`` renders the
+        default) except in the sandbox, where unsafe access must still raise.
+    """
+    environment_class = SandboxedEnvironment if sandboxed else Environment
+    env = environment_class(
+        loader=loader,
+        cache_size=400,
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+        autoescape=False,
+        optimized=True,
+        undefined=Undefined if sandboxed else ChainableUndefined,
+    )
+
+    # Add custom Jinja2 filters
+    env.filters['tojsonpretty'] = lambda obj: json.dumps(obj, indent=2)
+    env.globals.update(TEMPLATE_SNIPPETS)
+
+    return env
+
+
+def _default_bytecode_cache() -> Optional[BytecodeCache]:
+    """
+    Creates the on-disk bytecode cache used by the shared environments.
+
+    Returns:
+        A FileSystemBytecodeCache, or None if caching is disabled or the
+        directory cannot be created.
+    """
+    cache_dir = os.getenv(BYTECODE_CACHE_ENV, DEFAULT_BYTECODE_CACHE_DIR)
+    if not cache_dir:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Template bytecode cache disabled, cannot create {cache_dir}: {e}")
+        return None
+    return FileSystemBytecodeCache(directory=cache_dir, pattern="%s.cache")
+
+
+@lru_cache(maxsize=32)
+def _get_shared_environment(prompts_dir: str) -> Environment:
+    """
+    Returns the Jinja2 environment shared by all generators for a prompts directory.
+
+    Sharing the environment lets compiled templates survive across PromptGenerator
+    instances instead of being recompiled for every new generator, and the
+    bytecode cache lets them survive across processes.
+
+    Args:
+        prompts_dir: The absolute path to the directory containing prompt templates.
+
+    Returns:
+        The cached Jinja2 environment for the directory.
+    """
+    return _create_environment(FileSystemLoader(prompts_dir), _default_bytecode_cache())
+
 
 class PromptGenerator:
     """
@@ -16,20 +130,38 @@ class PromptGenerator:
     and code requirements, incorporating detailed best practices and tool information.
     """
 
-    def __init__(self, prompts_dir: str, config_path: str):
+    def __init__(
+        self,
+        prompts_dir: str,
+        config_path: str,
+        base_path: Optional[str] = None,
+        loader: Optional[BaseLoader] = None,
+        bytecode_cache: Optional[BytecodeCache] = None,
+        sandboxed: bool = False,
+    ):
         """
         Initializes the PromptGenerator.
 
         Args:
             prompts_dir: The absolute path to the directory containing prompt templates.
             config_path: The absolute path to the tech_stack_mapping.json file.
+            base_path: Optional knowledge base root passed to the KnowledgeManager.
+            loader: Optional Jinja2 loader (e.g. DictLoader) used instead of prompts_dir.
+            bytecode_cache: Optional Jinja2 bytecode cache (e.g. FileSystemBytecodeCache)
+                so compiled templates can be reused without re-parsing.
+            sandboxed: Render templates in a Jinja2 SandboxedEnvironment.
         """
-        self.env = Environment(loader=FileSystemLoader(prompts_dir))
-        
-        # Add custom Jinja2 filters
-        self.env.filters['tojsonpretty'] = lambda obj: json.dumps(obj, indent=2)
-        
-        self.knowledge_manager = KnowledgeManager(config_path)
+        if loader is not None or bytecode_cache is not None or sandboxed:
+            self.env = _create_environment(
+                loader or FileSystemLoader(prompts_dir), bytecode_cache, sandboxed
+            )
+        else:
+            self.env = _get_shared_environment(prompts_dir)
+        self.knowledge_manager = KnowledgeManager(config_path, base_path=base_path)
+        # Technology-derived context depends only on the set of technologies
+        self._tech_context_cache: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        # Rendering is deterministic for a template and its inputs
+        self._prompt_cache: Dict[Tuple[Any, ...], str] = {}
 
     def generate_prompt(self, config: PromptConfig) -> str:
         """
@@ -47,12 +179,80 @@ class PromptGenerator:
         Returns:
             A string containing the generated prompt.
         """
-        logger.info(f"Generating prompt for technologies: {config.technologies}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Generating prompt for technologies: {config.technologies}")
 
-        tech_data = self._collect_technology_data(config.technologies)
-        template_context = self._build_template_context(config, tech_data)
+        prompt_key = self._prompt_cache_key(config)
+        prompt = self._prompt_cache.get(prompt_key)
+        if prompt is not None:
+            return prompt
 
-        return self._render_template(config.template_name, template_context)
+        template_context = self._get_template_context(config)
+        prompt = self._render_template(config.template_name, template_context)
+
+        if len(self._prompt_cache) >= PROMPT_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del self._prompt_cache[next(iter(self._prompt_cache))]
+        self._prompt_cache[prompt_key] = prompt
+        return prompt
+
+    def stream_prompt(self, config: PromptConfig) -> Iterator[str]:
+        """
+        Yields the prompt in chunks as the template renders.
+
+        Lets callers write large prompts straight to a file or stdout without
+        holding the whole string; a prompt already in the cache is yielded whole.
+
+        Args:
+            config: Configuration object containing all prompt parameters.
+
+        Yields:
+            Consecutive chunks of the generated prompt.
+        """
+        prompt = self._prompt_cache.get(self._prompt_cache_key(config))
+        if prompt is not None:
+            yield prompt
+            return
+
+        template_context = self._get_template_context(config)
+        yield from self._load_template(config.template_name).generate(**template_context)
+
+    def _prompt_cache_key(self, config: PromptConfig) -> Tuple[Any, ...]:
+        """
+        Builds the rendered-prompt cache key from the inputs of the template context.
+
+        Args:
+            config: Prompt configuration object.
+
+        Returns:
+            A hashable key identifying the rendered prompt.
+        """
+        return (
+            config.template_name,
+            config.technologies,
+            config.task_type,
+            config.task_description,
+            config.code_requirements,
+        )
+
+    def _get_template_context(self, config: PromptConfig) -> Dict[str, Any]:
+        """
+        Builds the template context, reusing the cached technology-derived part.
+
+        Args:
+            config: Prompt configuration object.
+
+        Returns:
+            Dictionary containing all template variables.
+        """
+        tech_key = tuple(sorted(set(config.technologies)))
+        tech_context = self._tech_context_cache.get(tech_key)
+        if tech_context is None:
+            tech_data = self._collect_technology_data(config.technologies)
+            tech_context = self._build_tech_context(tech_data)
+            self._tech_context_cache[tech_key] = tech_context
+
+        return {**self._build_config_context(config), **tech_context}
 
     def _collect_technology_data(self, technologies: List[str]) -> Dict[str, List[str]]:
         """
@@ -129,56 +329,91 @@ class PromptGenerator:
         Returns:
             Dictionary containing all template variables.
         """
-        # Format best practices with defensive programming
+        return {**self._build_config_context(config), **self._build_tech_context(tech_data)}
+
+    def _build_config_context(self, config: PromptConfig) -> Dict[str, Any]:
+        """
+        Builds the template variables taken directly from the prompt configuration.
+
+        Args:
+            config: Prompt configuration object.
+
+        Returns:
+            Dictionary of per-call template variables.
+        """
+        return {
+            # Templates render the list form, e.g. {{ technologies }} -> ['python']
+            "technologies": list(config.technologies),
+            "technologies_list": ", ".join(config.technologies),
+            "task_type": config.task_type,
+            "task_description": config.task_description,
+            "code_requirements": config.code_requirements,
+            "role": "developer",
+            "guidelines_template": TASK_TYPE_TEMPLATES.get(
+                config.task_type, GENERIC_GUIDELINES_TEMPLATE
+            ),
+            "primary_tech": config.technologies[0] if config.technologies else "development",
+        }
+
+    def _build_tech_context(self, tech_data: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Builds the template variables derived from best practices and tools.
+
+        The result depends only on the technologies, so generate_prompt caches it
+        per technology set and must not mutate it.
+
+        Args:
+            tech_data: Technology-specific data (best practices and tools).
+
+        Returns:
+            Dictionary of knowledge base template variables.
+        """
+        # Format best practices and tools with defensive programming
         best_practices_data = tech_data.get("best_practices", [])
         if isinstance(best_practices_data, str):
             best_practices_data = [best_practices_data]
-        
-        detailed_best_practices = self._format_knowledge_items(
-            best_practices_data, self.knowledge_manager.get_best_practice_details
-        )
 
-        # Format tools with defensive programming  
         tools_data = tech_data.get("tools", [])
         if isinstance(tools_data, str):
             tools_data = [tools_data]
+
+        # Load all knowledge files up front so their reads overlap
+        self.knowledge_manager.preload(best_practices_data, tools_data)
+        
+        detailed_best_practices = self._format_knowledge_items(
+            best_practices_data, self.knowledge_manager.get_best_practice_details
+        )
             
         detailed_tools = self._format_knowledge_items(
             tools_data, self.knowledge_manager.get_tool_details
         )
 
-        # Create practice details dictionary for template compatibility
+        # Create practice details dictionary for template compatibility; the full
+        # content is already in best_practices, so only title and summary go here
         practice_details = {}
         for practice in best_practices_data:
-            details = self.knowledge_manager.get_best_practice_details(practice)
+            details = self.knowledge_manager.get_best_practice_summary(practice)
             if details:
                 practice_details[practice] = details
             else:
                 practice_details[practice] = f"Apply enterprise {practice} standards"
 
-        # Ensure we have lists for slicing operations
-        best_practices_list = tech_data.get("best_practices", [])
-        tools_list = tech_data.get("tools", [])
-        
-        # Defensive programming: ensure we have lists, not strings
-        if isinstance(best_practices_list, str):
-            best_practices_list = [best_practices_list]
-        if isinstance(tools_list, str):
-            tools_list = [tools_list]
-        
+        # Structured data for advanced templates (increased for comprehensive coverage);
+        # tuples since the cached context is shared between renders
+        best_practices_list = tuple(best_practices_data[:10])
+        tools_list = tuple(tools_data[:10])
+        tool_names = [
+            tool.get("name", tool) if isinstance(tool, dict) else tool for tool in tools_list
+        ]
+
         return {
-            "technologies": config.technologies,
-            "technologies_list": ", ".join(config.technologies),
-            "task_type": config.task_type,
-            "task_description": config.task_description,
             "best_practices": "\n\n".join(detailed_best_practices),
             "tools": "\n\n".join(detailed_tools),
-            "code_requirements": config.code_requirements,
-            "role": "developer",
-            # Structured data for advanced templates
-            "best_practices_list": best_practices_list[:10],  # Increased for comprehensive coverage
-            "tools_list": tools_list[:10],  # Increased for comprehensive coverage
-            "primary_tech": config.technologies[0] if config.technologies else "development",
+            "best_practices_list": best_practices_list,
+            "tools_list": tools_list,
+            # Bullet lists prebuilt once so templates can skip a {% for %} loop
+            "best_practices_rendered": "\n".join(f"- {bp}" for bp in best_practices_list),
+            "tools_rendered": "\n".join(f"- **{name}**" for name in tool_names),
             "practice_details": practice_details,
         }
 
@@ -193,17 +428,38 @@ class PromptGenerator:
         Returns:
             Rendered template string.
 
+        Raises:
+            Exception: If template loading fails and fallback also fails.
+        """
+        return self._load_template(template_name).render(**context)
+
+    def _load_template(self, template_name: str) -> Template:
+        """
+        Loads a template, falling back to the generic template.
+
+        Args:
+            template_name: Name of the template file.
+
+        Returns:
+            The requested template, or the generic one if it is missing or broken.
+
         Raises:
             Exception: If template loading fails and fallback also fails.
         """
         try:
-            template = self.env.get_template(template_name)
+            # A missing template falls through to the generic one without raising
+            template = self.env.select_template([template_name, GENERIC_TEMPLATE])
         except Exception as e:
-            logger.error(f"Error loading template {template_name}: {e}")
+            logger.error(f"Template rendering error in {template_name}: {e}")
             # Fallback to generic template
-            template = self.env.get_template("base_prompts/generic_code_prompt.txt")
-
-        return template.render(**context)
+            template = self.env.get_template(GENERIC_TEMPLATE)
+        else:
+            if template.name != template_name:
+                logger.warning(
+                    f"Template not found: {template_name}, falling back to generic template"
+                )
+
+        return template
 
     # Legacy method for backward compatibility
     def generate_prompt_legacy(
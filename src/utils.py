@@ -3,6 +3,11 @@ import logging
 import os
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -21,13 +26,20 @@ def safe_path_join(base_dir: str, *paths: str) -> str:
         The securely joined and normalized absolute path.
 
     Raises:
-        ValueError: If the resulting path attempts to traverse outside the base_dir.
+        ValueError: If a component contains a null byte or the resulting path
+            attempts to traverse outside the base_dir.
     """
-    combined_path = os.path.join(base_dir, *paths)
-    normalized_path = os.path.normpath(combined_path)
-    absolute_path = os.path.abspath(normalized_path)
+    # A null byte would truncate the path at the OS level, hiding what follows it
+    if "\x00" in "".join(paths):
+        raise ValueError("Path components must not contain null bytes")
+
+    base_path = os.path.abspath(base_dir)
+    # abspath normalizes too, so "..", "." and duplicate separators are resolved here
+    absolute_path = os.path.abspath(os.path.join(base_dir, *paths))
 
-    if not absolute_path.startswith(os.path.abspath(base_dir)):
+    # Compare against the base plus a trailing separator so siblings such as
+    # "/base_other" do not pass as being inside "/base"
+    if absolute_path != base_path and not absolute_path.startswith(os.path.join(base_path, "")):
         raise ValueError(f"Attempted directory traversal: {absolute_path} is not within {base_dir}")
 
     return absolute_path
@@ -37,6 +49,8 @@ def load_json_file(filepath: str) -> Dict[str, Any]:
     """
     Loads and parses a JSON file from the given filepath.
 
+    Uses orjson on the raw bytes when it is installed, falling back to json.
+
     Args:
         filepath: The absolute path to the JSON file.
 
@@ -49,9 +63,14 @@ def load_json_file(filepath: str) -> Dict[str, Any]:
         IOError: For other I/O related errors.
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        logger.info(f"Successfully loaded JSON from: {filepath}")
+        if orjson is not None:
+            with open(filepath, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Successfully loaded JSON from: {filepath}")
         return data
     except FileNotFoundError:
         logger.error(f"Error: File not found at {filepath}")
@@ -81,7 +100,8 @@ def read_text_file(filepath: str) -> str:
     try:
         with open(filepath, "r", encoding="utf-8") as f:
             content = f.read()
-        logger.info(f"Successfully read text from: {filepath}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Successfully read text from: {filepath}")
         return content
     except FileNotFoundError:
         logger.error(f"Error: File not found at {filepath}")
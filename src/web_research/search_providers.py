@@ -125,10 +125,10 @@ class BaseSearchProvider(ISearchProvider):
         if query_lower in snippet_lower:
             score += 0.3
 
-        # Word matches
+        # Word matches (sets make each membership test O(1))
         query_words = query_lower.split()
-        title_words = title_lower.split()
-        snippet_words = snippet_lower.split()
+        title_words = set(title_lower.split())
+        snippet_words = set(snippet_lower.split())
 
         title_matches = sum(1 for word in query_words if word in title_words)
         snippet_matches = sum(1 for word in query_words if word in snippet_words)
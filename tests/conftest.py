@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the whole test suite.
+"""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from src.prompt_generator import BYTECODE_CACHE_ENV
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is an optional speedup
+    uvloop = None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_bytecode_cache(tmp_path_factory):
+    """Keep compiled templates from the tests out of the user's cache directory."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv(BYTECODE_CACHE_ENV, str(tmp_path_factory.mktemp("jinja_bytecode")))
+        yield
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """
+    Virtual clock for the performance gates.
+
+    The gates time operations with this clock, and time.sleep/asyncio.sleep
+    advance it instead of blocking, so gates observe the intended durations
+    without the test waiting for them.
+    """
+    now = [0.0]
+    real_async_sleep = asyncio.sleep
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    async def async_sleep(seconds, result=None):
+        now[0] += seconds
+        return await real_async_sleep(0, result)
+
+    monkeypatch.setattr("src.performance_gates._clock", lambda: now[0])
+    monkeypatch.setattr(time, "sleep", sleep)
+    monkeypatch.setattr(asyncio, "sleep", async_sleep)
+    return now
+
+
+if uvloop is not None and sys.platform != "win32":
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
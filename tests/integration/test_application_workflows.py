@@ -914,7 +914,7 @@ Please provide:
         assert context["task_type"] == "web_application"
         assert context["task_description"] == "E-commerce platform"
         assert context["code_requirements"] == "Scalable, secure, well-tested application"
-        assert context["best_practices_list"] == ["Clean Code", "Security", "Performance"]
+        assert context["best_practices_list"] == ("Clean Code", "Security", "Performance")
         assert len(context["tools_list"]) == 2
 
     def test_template_inheritance_and_blocks(self, complex_template_setup, tmp_path):
@@ -5,6 +5,7 @@ Provides concrete performance measurements and validates that performance
 thresholds are realistic and achievable in practice.
 """
 
+import array
 import asyncio
 import json
 import statistics
@@ -35,6 +36,22 @@ from src.performance_gates import (
 )
 
 
+@pytest.fixture(scope="module")
+def shared_event_bus():
+    """Event bus constructed once per module and reset by each test."""
+    bus = EventBus()
+    yield bus
+    bus.reset()
+
+
+@pytest.fixture(scope="module")
+def shared_tracker():
+    """Performance tracker constructed once per module and reset by each test."""
+    tracker = PerformanceTracker()
+    yield tracker
+    tracker.reset()
+
+
 class TestPerformanceBenchmarks:
     """Actual performance benchmarks to validate thresholds."""
 
@@ -67,7 +84,7 @@ class TestPerformanceBenchmarks:
             time.sleep(delay_ms / 1000)
             return {"status": "success", "data": "response"}
 
-        execution_times = []
+        execution_times = array.array("d")
 
         # Perform 100 simulated API calls
         for i in range(100):
@@ -107,7 +124,7 @@ class TestPerformanceBenchmarks:
                 test_files.append(f.name)
 
         try:
-            execution_times = []
+            execution_times = array.array("d")
 
             # Benchmark async file reading
             for file_path in test_files:
@@ -215,9 +232,10 @@ class TestPerformanceBenchmarks:
         final_memory_mb = memory_snapshots[-1] / (1024 * 1024) if memory_snapshots else 0
         assert final_memory_mb < 50, f"Memory usage {final_memory_mb:.2f}MB too high for test"
 
-    def test_event_system_performance_benchmark(self):
+    def test_event_system_performance_benchmark(self, shared_event_bus):
         """Benchmark event system performance."""
-        event_bus = EventBus()
+        event_bus = shared_event_bus
+        event_bus.reset()
         events_processed = []
 
         def event_handler(event):
@@ -313,9 +331,11 @@ class TestPerformanceBenchmarks:
 class TestPerformanceMetricsCollection:
     """Test actual metrics collection and accuracy."""
 
-    def setup_method(self):
-        """Setup performance tracker."""
-        self.tracker = PerformanceTracker()
+    @pytest.fixture(autouse=True)
+    def setup_tracker(self, shared_tracker):
+        """Reset the shared performance tracker before each test."""
+        shared_tracker.reset()
+        self.tracker = shared_tracker
 
     def test_performance_tracker_accuracy(self):
         """Test performance tracker provides accurate measurements."""
@@ -459,12 +479,8 @@ class TestPerformanceGateValidation:
             500,  # Slower responses
         ]
 
-        for time_ms in realistic_times:
-            gate.check_api_response_time(time_ms, "p95")
-
         # Add more fast responses to improve percentiles
-        for _ in range(10):
-            gate.check_api_response_time(80, "p95")
+        gate.check_api_response_times_bulk(realistic_times + [80] * 10, "p95")
 
         # Calculate actual percentile
         p95_value = gate._calculate_current_percentile("p95")
@@ -527,16 +543,14 @@ class TestPerformanceGateValidation:
         initial_violations = len(gate.violations)
 
         # Fast queries should not trigger violations
-        for query_time in fast_queries:
-            gate.check_database_query_time(query_time, "simple")
+        gate.check_database_query_times_bulk(fast_queries, "simple")
 
         assert (
             len(gate.violations) == initial_violations
         ), "Fast queries should not trigger violations"
 
         # Slow queries should trigger violations
-        for query_time in slow_queries:
-            gate.check_database_query_time(query_time, "simple")
+        gate.check_database_query_times_bulk(slow_queries, "simple")
 
         assert len(gate.violations) == initial_violations + len(
             slow_queries
@@ -6,12 +6,15 @@ and integration patterns to ensure enterprise-grade reliability.
 """
 
 import asyncio
+import copy
+import pickle
 import time
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.performance_gates import (
+    PERCENTILE_WINDOW_SIZE,
     PerformanceGate,
     PerformanceThreshold,
     PerformanceViolation,
@@ -25,6 +28,9 @@ from src.performance_gates import (
     performance_gate_context,
 )
 
+# Async tests share one event loop instead of creating a fresh loop per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 class TestPerformanceThreshold:
     """Test PerformanceThreshold dataclass."""
@@ -58,6 +64,15 @@ class TestPerformanceThreshold:
         with pytest.raises(AttributeError):
             threshold.value = 200.0
 
+    def test_threshold_has_no_instance_dict(self):
+        """Test thresholds use slots yet still copy and pickle by value."""
+        threshold = PerformanceGate.THRESHOLDS["api_response_p95"]
+
+        assert not hasattr(threshold, "__dict__")
+        assert copy.deepcopy(threshold) == threshold
+        assert pickle.loads(pickle.dumps(threshold)) == threshold
+        assert hash(copy.copy(threshold)) == hash(threshold)
+
 
 class TestPerformanceViolation:
     """Test PerformanceViolation exception and data structure."""
@@ -101,13 +116,22 @@ class TestPerformanceViolation:
         assert str(violation) == expected
 
 
+@pytest.fixture(scope="class")
+def shared_gate():
+    """Non-enforcing gate built once per test class."""
+    return PerformanceGate(enable_enforcement=False)
+
+
+@pytest.fixture
+def gate(shared_gate):
+    """Shared non-enforcing gate, reset after each test."""
+    yield shared_gate
+    shared_gate.reset()
+
+
 class TestPerformanceGate:
     """Test PerformanceGate class functionality."""
 
-    def setup_method(self):
-        """Setup for each test method."""
-        self.gate = PerformanceGate(enable_enforcement=False)
-
     def test_gate_initialization(self):
         """Test gate initialization with default thresholds."""
         gate = PerformanceGate()
@@ -135,29 +159,47 @@ class TestPerformanceGate:
         assert "custom" in gate.thresholds
         assert gate.thresholds["custom"] == custom_threshold
 
-    def test_api_response_time_tracking(self):
+    def test_api_response_time_tracking(self, gate):
         """Test API response time tracking without violations."""
         # Add multiple response times
         for duration in [150, 180, 160, 170, 165]:
-            self.gate.check_api_response_time(duration, "p95")
+            gate.check_api_response_time(duration, "p95")
 
-        assert len(self.gate._response_times) == 5
-        assert self.gate._response_times == [150, 180, 160, 170, 165]
+        assert len(gate._response_times) == 5
+        assert gate._response_times == [150, 180, 160, 170, 165]
 
-    def test_api_response_time_percentile_calculation(self):
+    def test_api_response_time_percentile_calculation(self, gate):
         """Test percentile calculation with sufficient samples."""
         # Add 25 samples to trigger percentile calculation
         response_times = [100 + i * 5 for i in range(25)]  # 100, 105, 110, ..., 220
 
         for duration in response_times:
-            self.gate.check_api_response_time(duration, "p95")
+            gate.check_api_response_time(duration, "p95")
 
         # With 25 samples, p95 should be around index 23 (0.95 * 25 = 23.75)
         sorted_times = sorted(response_times)
         expected_p95 = sorted_times[23]  # Should be 215
 
         # Verify no violation since 215 > 200 but enforcement is disabled
-        assert len(self.gate.violations) == 0
+        assert len(gate.violations) == 0
+
+    def test_percentile_window_tracks_recent_samples(self, gate):
+        """Test the sorted percentile window matches the last 100 samples."""
+        single = [(i * 37) % 251 for i in range(130)]
+        for duration in single:
+            gate.check_api_response_time(duration, "p95")
+        gate.check_api_response_times_bulk([500 - i for i in range(40)], "p95")
+        gate.check_api_response_times_bulk(list(range(150)), "p99")
+
+        samples = single + [500 - i for i in range(40)] + list(range(150))
+        for extra in (7, 260, 7):
+            gate.check_api_response_time(extra, "p95")
+            samples.append(extra)
+
+        expected_window = sorted(samples[-PERCENTILE_WINDOW_SIZE:])
+        assert gate._recent_times_sorted == expected_window
+        assert gate._calculate_current_percentile("p95") == expected_window[95]
+        assert gate._calculate_current_percentile("p99") == expected_window[99]
 
     def test_api_response_time_violation_enforcement(self):
         """Test API response time violation with enforcement enabled."""
@@ -170,23 +212,48 @@ class TestPerformanceGate:
             for duration in high_response_times:
                 gate.check_api_response_time(duration, "p95")
 
-    def test_unknown_percentile_handling(self):
+    def test_api_response_times_bulk_tracking(self, gate):
+        """Test bulk check records every sample in order."""
+        gate.check_api_response_times_bulk([150, 180, 160, 170, 165], "p95")
+
+        assert gate._response_times == [150, 180, 160, 170, 165]
+        assert len(gate.violations) == 0
+
+    def test_api_response_times_bulk_violation_enforcement(self):
+        """Test bulk check raises once the batch pushes p95 over threshold."""
+        gate = PerformanceGate(enable_enforcement=True)
+
+        with pytest.raises(PerformanceViolation):
+            gate.check_api_response_times_bulk([300, 350, 400, 450, 500] * 5, "p95")
+
+        assert len(gate._response_times) == 25
+        assert len(gate.violations) == 1
+
+    def test_api_response_times_bulk_unknown_percentile(self, gate):
+        """Test bulk check ignores unknown percentiles."""
+        with patch("src.performance_gates.logger") as mock_logger:
+            gate.check_api_response_times_bulk([150, 160], "p90")
+            mock_logger.warning.assert_called_with("Unknown percentile threshold: p90")
+
+        assert gate._response_times == []
+
+    def test_unknown_percentile_handling(self, gate):
         """Test handling of unknown percentile values."""
         with patch("src.performance_gates.logger") as mock_logger:
-            self.gate.check_api_response_time(150, "p90")
+            gate.check_api_response_time(150, "p90")
             mock_logger.warning.assert_called_with("Unknown percentile threshold: p90")
 
-    def test_database_query_time_check(self):
+    def test_database_query_time_check(self, gate):
         """Test database query time checking."""
         # Fast query should pass
-        self.gate.check_database_query_time(50.0, "simple")
-        assert len(self.gate.violations) == 0
+        gate.check_database_query_time(50.0, "simple")
+        assert len(gate.violations) == 0
 
         # Slow query should create violation but not raise (enforcement disabled)
-        self.gate.check_database_query_time(150.0, "simple")
-        assert len(self.gate.violations) == 1
+        gate.check_database_query_time(150.0, "simple")
+        assert len(gate.violations) == 1
 
-        violation = self.gate.violations[0]
+        violation = gate.violations[0]
         assert violation.actual_value == 150.0
         assert violation.threshold.value == 100.0
 
@@ -197,19 +264,41 @@ class TestPerformanceGate:
         with pytest.raises(PerformanceViolation):
             gate.check_database_query_time(150.0, "simple")
 
-    def test_memory_growth_baseline_setting(self):
+    def test_database_query_times_bulk(self, gate):
+        """Test bulk query check records one violation per slow query."""
+        gate.check_database_query_times_bulk([50.0, 150.0, 200.0], "simple")
+
+        assert [v.actual_value for v in gate.violations] == [150.0, 200.0]
+
+    def test_database_query_times_bulk_with_enforcement(self):
+        """Test bulk query check records every violation, then raises the first."""
+        gate = PerformanceGate(enable_enforcement=True)
+
+        with pytest.raises(PerformanceViolation) as exc_info:
+            gate.check_database_query_times_bulk([50.0, 150.0, 200.0], "simple")
+
+        assert exc_info.value.actual_value == 150.0
+        assert len(gate.violations) == 2
+
+    def test_database_query_times_bulk_ignores_other_query_types(self, gate):
+        """Test bulk query check only enforces the simple query threshold."""
+        gate.check_database_query_times_bulk([500.0], "complex")
+
+        assert gate.violations == []
+
+    def test_memory_growth_baseline_setting(self, gate):
         """Test memory growth baseline initialization."""
         with (
             patch("tracemalloc.is_tracing", return_value=True),
             patch("tracemalloc.get_traced_memory", return_value=(1024 * 1024, 2048 * 1024)),
         ):
 
-            self.gate.check_memory_growth()
+            gate.check_memory_growth()
 
-            assert self.gate._memory_baseline == 1.0  # 1MB in MB
-            assert self.gate._memory_start_time is not None
+            assert gate._memory_baseline == 1.0  # 1MB in MB
+            assert gate._memory_start_time is not None
 
-    def test_memory_growth_calculation(self):
+    def test_memory_growth_calculation(self, gate):
         """Test memory growth rate calculation."""
         with (
             patch("tracemalloc.is_tracing", return_value=True),
@@ -220,7 +309,7 @@ class TestPerformanceGate:
             # Set up baseline
             mock_memory.return_value = (1024 * 1024, 2048 * 1024)  # 1MB current
             mock_time.return_value = 1000.0
-            self.gate.check_memory_growth()
+            gate.check_memory_growth()
 
             # Simulate memory growth after 1 hour
             mock_memory.return_value = (
@@ -229,33 +318,49 @@ class TestPerformanceGate:
             )  # 1.2MB current (20% growth)
             mock_time.return_value = 1000.0 + 3600.0  # 1 hour later
 
-            self.gate.check_memory_growth()
+            gate.check_memory_growth()
 
             # Should create violation for 20% growth rate (> 10% threshold)
-            assert len(self.gate.violations) == 1
-            violation = self.gate.violations[0]
+            assert len(gate.violations) == 1
+            violation = gate.violations[0]
             assert violation.actual_value == 20.0  # 20% growth rate per hour
 
-    def test_memory_growth_no_tracemalloc(self):
+    def test_memory_growth_no_tracemalloc(self, gate):
         """Test memory growth check when tracemalloc is not enabled."""
         with (
             patch("tracemalloc.is_tracing", return_value=False),
             patch("src.performance_gates.logger") as mock_logger,
         ):
 
-            self.gate.check_memory_growth()
+            gate.check_memory_growth()
 
             mock_logger.warning.assert_called_with(
                 "Memory tracking not enabled, cannot check memory growth"
             )
 
-    def test_violation_summary(self):
+            gate.check_memory_growth()
+            mock_logger.warning.assert_called_once()
+
+    def test_memory_growth_skips_memory_read_before_check_interval(self, gate):
+        """Test traced memory is only read for the baseline and due checks."""
+        with (
+            patch("tracemalloc.is_tracing", return_value=True),
+            patch("tracemalloc.get_traced_memory", return_value=(1024 * 1024, 0)) as mock_memory,
+            patch("time.time", return_value=1000.0),
+        ):
+            gate.check_memory_growth()
+            gate.check_memory_growth()
+
+        mock_memory.assert_called_once()
+        assert gate._memory_baseline == 1.0
+
+    def test_violation_summary(self, gate):
         """Test performance violation summary generation."""
         # Create some violations
-        self.gate.check_database_query_time(150.0, "simple")
-        self.gate.check_database_query_time(200.0, "simple")
+        gate.check_database_query_time(150.0, "simple")
+        gate.check_database_query_time(200.0, "simple")
 
-        summary = self.gate.get_violation_summary()
+        summary = gate.get_violation_summary()
 
         assert summary["total_violations"] == 2
         assert "violations_by_type" in summary
@@ -264,40 +369,85 @@ class TestPerformanceGate:
         assert summary["enforcement_enabled"] is False
         assert "thresholds" in summary
 
-    def test_percentile_helper_methods(self):
+    def test_violation_summary_groups_by_type(self, gate):
+        """Test summary entries follow recording order and are copies of the index."""
+        gate.check_database_query_times_bulk([150.0, 250.0], "simple")
+        gate.check_api_response_times_bulk([300.0] * 25, "p95")
+
+        summary = gate.get_violation_summary()
+        by_type = summary["violations_by_type"]
+
+        assert [entry["actual_value"] for entry in by_type["database_query_time"]] == [
+            150.0,
+            250.0,
+        ]
+        assert len(by_type["api_response_time"]) == 1
+        assert summary["total_violations"] == 3
+
+        by_type["database_query_time"].clear()
+        assert len(gate.get_violation_summary()["violations_by_type"]["database_query_time"]) == 2
+
+    def test_reset_clears_recorded_state(self, gate):
+        """Test reset discards samples and violations but keeps configuration."""
+        gate.check_api_response_times_bulk([300.0] * 25, "p95")
+        gate.check_database_query_time(150.0, "simple")
+
+        gate.reset()
+
+        assert gate.violations == []
+        assert gate.get_violation_summary()["violations_by_type"] == {}
+        assert gate._response_times == []
+        assert gate._recent_times_sorted == []
+        assert gate._calculate_current_percentile("p95") is None
+        assert gate._memory_baseline is None
+        assert gate.enable_enforcement is False
+        assert "api_response_p95" in gate.thresholds
+
+    def test_percentile_helper_methods(self, gate):
         """Test percentile calculation helper methods."""
         # Test p95 calculation
-        index_p95 = self.gate._get_percentile_index("p95", 100)
+        index_p95 = gate._get_percentile_index("p95", 100)
         assert index_p95 == 95
 
         # Test p99 calculation
-        index_p99 = self.gate._get_percentile_index("p99", 100)
+        index_p99 = gate._get_percentile_index("p99", 100)
         assert index_p99 == 99
 
         # Test unknown percentile
-        index_unknown = self.gate._get_percentile_index("p90", 100)
+        index_unknown = gate._get_percentile_index("p90", 100)
         assert index_unknown == 99  # Defaults to max
 
-    def test_calculate_current_percentile_insufficient_samples(self):
+    def test_calculate_current_percentile_insufficient_samples(self, gate):
         """Test percentile calculation with insufficient samples."""
         # Add only 10 samples (< 20 required)
-        for i in range(10):
-            self.gate._response_times.append(100 + i * 10)
+        gate._record_response_times([100 + i * 10 for i in range(10)])
 
-        result = self.gate._calculate_current_percentile("p95")
+        result = gate._calculate_current_percentile("p95")
         assert result is None
 
-    def test_calculate_current_percentile_sufficient_samples(self):
+    def test_calculate_current_percentile_sufficient_samples(self, gate):
         """Test percentile calculation with sufficient samples."""
         # Add 25 samples
-        for i in range(25):
-            self.gate._response_times.append(100 + i * 10)
+        gate._record_response_times([100 + i * 10 for i in range(25)])
 
-        result = self.gate._calculate_current_percentile("p95")
+        result = gate._calculate_current_percentile("p95")
         assert result is not None
         assert isinstance(result, float)
 
+    def test_calculate_current_percentile_cached_until_new_sample(self, gate):
+        """Test percentile is reused until another sample is recorded."""
+        gate._record_response_times([100.0 + i * 10 for i in range(25)])
+
+        first = gate._calculate_current_percentile("p95")
+        with patch.object(gate, "_get_percentile_index") as mock_index:
+            assert gate._calculate_current_percentile("p95") == first
+            mock_index.assert_not_called()
 
+        gate._record_response_times([1000.0])
+        assert gate._calculate_current_percentile("p95") != first
+
+
+@pytest.mark.usefixtures("fake_clock")
 class TestPerformanceDecorators:
     """Test performance monitoring decorators."""
 
@@ -324,7 +474,31 @@ class TestPerformanceDecorators:
         result = slow_function()
         assert result == "success"
 
-    @pytest.mark.asyncio
+    def test_api_response_time_decorator_unknown_percentile(self):
+        """Test unknown percentiles are reported on each call without failing it."""
+
+        @enforce_api_response_time("p50")
+        def function():
+            return "success"
+
+        with patch("src.performance_gates.logger") as mock_logger:
+            assert function() == "success"
+
+        mock_logger.warning.assert_called_once_with("Unknown percentile threshold: p50")
+
+    def test_api_response_time_decorator_uses_current_gate(self):
+        """Test the gate is looked up per call, so later replacements take effect."""
+
+        @enforce_api_response_time("p99")
+        def function():
+            return "success"
+
+        with patch("src.performance_gates.performance_gate") as mock_gate:
+            assert function() == "success"
+
+        mock_gate._check_api_response.assert_called_once()
+        assert mock_gate._check_api_response.call_args.args[0] == "api_response_p99"
+
     async def test_api_response_time_decorator_async(self):
         """Test API response time decorator on async function."""
 
@@ -347,7 +521,6 @@ class TestPerformanceDecorators:
         result = fast_query()
         assert result == {"data": "result"}
 
-    @pytest.mark.asyncio
     async def test_database_query_decorator_async(self):
         """Test database query time decorator on async function."""
 
@@ -360,6 +533,7 @@ class TestPerformanceDecorators:
         assert result == {"data": "async_result"}
 
 
+@pytest.mark.usefixtures("fake_clock")
 class TestPerformanceContextManagers:
     """Test performance context managers."""
 
@@ -369,7 +543,6 @@ class TestPerformanceContextManagers:
             assert gate is not None
             time.sleep(0.01)  # Small delay
 
-    @pytest.mark.asyncio
     async def test_async_performance_gate_context_manager(self):
         """Test async performance gate context manager."""
         async with async_performance_gate_context(check_memory=True) as gate:
@@ -391,83 +564,69 @@ class TestPerformanceContextManagers:
 class TestIntegrationAndInitialization:
     """Test system integration and initialization."""
 
-    def test_integration_with_monitoring_success(self):
+    @pytest.fixture(autouse=True)
+    def mock_logger(self, monkeypatch):
+        """Replace the module logger for every test in this class."""
+        logger = MagicMock()
+        monkeypatch.setattr("src.performance_gates.logger", logger)
+        return logger
+
+    def test_integration_with_monitoring_success(self, mock_logger):
         """Test successful integration with existing monitoring."""
-        with patch("src.performance_gates.logger") as mock_logger:
-            result = integrate_with_existing_monitoring()
+        result = integrate_with_existing_monitoring()
 
-            assert result is True
-            mock_logger.info.assert_called_with(
-                "Performance gates successfully integrated with existing monitoring"
-            )
+        assert result is True
+        mock_logger.info.assert_called_with(
+            "Performance gates successfully integrated with existing monitoring"
+        )
 
-    def test_integration_import_error(self):
+    def test_integration_import_error(self, mock_logger):
         """Test integration failure due to import error."""
-        with (
-            patch("src.performance_gates.logger") as mock_logger,
-            patch("builtins.__import__", side_effect=ImportError("Test import error")),
-        ):
-
+        with patch("builtins.__import__", side_effect=ImportError("Test import error")):
             result = integrate_with_existing_monitoring()
 
-            assert result is False
-            mock_logger.error.assert_called()
+        assert result is False
+        mock_logger.error.assert_called()
 
-    def test_integration_unexpected_error(self):
+    def test_integration_unexpected_error(self, mock_logger):
         """Test integration failure due to unexpected error."""
-        with (
-            patch("src.performance_gates.logger") as mock_logger,
-            patch(
-                "src.performance_gates._patch_monitoring_system",
-                side_effect=RuntimeError("Test error"),
-            ),
+        with patch(
+            "src.performance_gates._patch_monitoring_system",
+            side_effect=RuntimeError("Test error"),
         ):
-
             result = integrate_with_existing_monitoring()
 
-            assert result is False
-            mock_logger.error.assert_called()
+        assert result is False
+        mock_logger.error.assert_called()
 
-    def test_initialize_performance_gates_success(self):
+    def test_initialize_performance_gates_success(self, mock_logger):
         """Test successful performance gates initialization."""
-        with (
-            patch("src.performance_gates.integrate_with_existing_monitoring", return_value=True),
-            patch("src.performance_gates.logger") as mock_logger,
-        ):
-
+        with patch("src.performance_gates.integrate_with_existing_monitoring", return_value=True):
             result = initialize_performance_gates()
 
-            assert result is True
-            mock_logger.info.assert_called_with("Performance gates system initialized successfully")
+        assert result is True
+        mock_logger.info.assert_called_with("Performance gates system initialized successfully")
 
-    def test_initialize_performance_gates_integration_failure(self):
+    def test_initialize_performance_gates_integration_failure(self, mock_logger):
         """Test initialization with integration failure."""
-        with (
-            patch("src.performance_gates.integrate_with_existing_monitoring", return_value=False),
-            patch("src.performance_gates.logger") as mock_logger,
-        ):
-
+        with patch("src.performance_gates.integrate_with_existing_monitoring", return_value=False):
             result = initialize_performance_gates()
 
-            assert result is True  # Still returns True but logs warning
-            mock_logger.warning.assert_called_with(
-                "Performance gates initialized but integration failed"
-            )
+        assert result is True  # Still returns True but logs warning
+        mock_logger.warning.assert_called_with(
+            "Performance gates initialized but integration failed"
+        )
 
-    def test_initialize_performance_gates_exception(self):
+    def test_initialize_performance_gates_exception(self, mock_logger):
         """Test initialization with exception."""
-        with (
-            patch(
-                "src.performance_gates.integrate_with_existing_monitoring",
-                side_effect=RuntimeError("Test error"),
-            ),
-            patch("src.performance_gates.logger") as mock_logger,
+        with patch(
+            "src.performance_gates.integrate_with_existing_monitoring",
+            side_effect=RuntimeError("Test error"),
         ):
-
             result = initialize_performance_gates()
 
-            assert result is False
-            mock_logger.error.assert_called()
+        assert result is False
+        mock_logger.error.assert_called()
 
 
 class TestGlobalPerformanceGate:
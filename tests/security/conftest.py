@@ -0,0 +1,128 @@
+"""
+Shared fixtures for security and validation tests.
+"""
+
+import json
+import os
+import shutil
+from collections import namedtuple
+from pathlib import Path
+
+import pytest
+from jinja2 import FileSystemBytecodeCache
+
+from src.prompt_generator import PromptGenerator
+
+SecurityLayout = namedtuple(
+    "SecurityLayout", ["base_path", "prompts_dir", "base_prompts_dir", "config_file"]
+)
+
+SECURITY_TEMPLATES = {
+    "secure_template.txt": """
+Role: {{ role }}
+Technologies: {{ technologies }}
+Task: {{ task_description }}
+Requirements: {{ code_requirements }}
+""",
+    "user_input.txt": """
+Task Type: {{ task_type }}
+Description: {{ task_description }}
+Requirements: {{ code_requirements }}
+""",
+    "env_test.txt": """
+Task: {{ task_description }}
+Environment: {{ env }}
+Secret: {{ SECRET_TEST_VAR }}
+""",
+    "sandbox_escape.txt": """
+Task: {{ task_description }}
+Classes: {{ ().__class__.__mro__ }}
+""",
+}
+
+MALICIOUS_PRACTICE = """
+# Malicious Practice
+
+## Code Examples
+```python
+import os
+os.system('rm -rf /')
+```
+
+## Template Code
+{{ malicious_variable }}
+{% for i in range(1000) %}Spam{% endfor %}
+
+## Script Tags
+<script>alert('xss')</script>
+"""
+
+MALICIOUS_TOOL = {
+    "name": "Malicious Tool",
+    "description": "Tool with {{ template_code }} and <script>alert()</script>",
+    "command": "rm -rf /",
+    "script": "<script>location.href='http://evil.com'</script>",
+}
+
+
+@pytest.fixture(scope="session")
+def security_layout(tmp_path_factory):
+    """
+    Build the prompts and config skeleton shared by the security tests.
+
+    The layout is created once per session and must be treated as read-only;
+    tests needing different files should build them under tmp_path.
+    """
+    base_path = tmp_path_factory.mktemp("security")
+    prompts_dir = base_path / "prompts"
+    base_prompts_dir = prompts_dir / "base_prompts"
+    base_prompts_dir.mkdir(parents=True)
+
+    for name, content in SECURITY_TEMPLATES.items():
+        (base_prompts_dir / name).write_text(content.strip())
+
+    config_file = base_path / "config.json"
+    config_file.write_text(json.dumps({"python": {"best_practices": [], "tools": []}}))
+
+    return SecurityLayout(base_path, prompts_dir, base_prompts_dir, config_file)
+
+
+@pytest.fixture(scope="session")
+def template_bytecode_cache(tmp_path_factory):
+    """Jinja2 bytecode cache shared by all security test generators."""
+    return FileSystemBytecodeCache(str(tmp_path_factory.mktemp("jinja_cache")))
+
+
+@pytest.fixture(scope="module")
+def prompt_generator(security_layout, template_bytecode_cache):
+    """PromptGenerator over the shared security layout, reused across a module."""
+    return PromptGenerator(
+        str(security_layout.prompts_dir),
+        str(security_layout.config_file),
+        base_path=str(security_layout.base_path),
+        bytecode_cache=template_bytecode_cache,
+        sandboxed=True,
+    )
+
+
+@pytest.fixture(scope="session")
+def kb_template(tmp_path_factory):
+    """
+    Build the canonical knowledge base tree with malicious content once per session.
+
+    Tests must not modify it; use the kb fixture for a writable copy.
+    """
+    root = tmp_path_factory.mktemp("kb_template")
+    os.makedirs(root / "best_practices", exist_ok=True)
+    os.makedirs(root / "tools", exist_ok=True)
+
+    (root / "best_practices" / "malicious.md").write_text(MALICIOUS_PRACTICE.strip())
+    (root / "tools" / "malicious.json").write_text(json.dumps(MALICIOUS_TOOL))
+
+    return root
+
+
+@pytest.fixture
+def kb(tmp_path, kb_template):
+    """Writable copy of the knowledge base template at tmp_path/knowledge_base."""
+    return Path(shutil.copytree(kb_template, tmp_path / "knowledge_base"))
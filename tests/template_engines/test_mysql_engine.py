@@ -1,94 +1,78 @@
-#!/usr/bin/env python3
 """
-Test script for MySQL/MariaDB template engine.
+Tests for the MySQL/MariaDB template engine.
 """
 
 import asyncio
-import logging
-import sys
-from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from src.prompt_config import SpecificOptions
 from src.web_research.template_engines.base_engine import TemplateContext
 from src.web_research.template_engines.mysql_engine import MySQLTemplateEngine
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 
+@pytest.fixture(scope="module")
+def engine():
+    """MySQL template engine shared by all tests in this module."""
+    return MySQLTemplateEngine()
 
-async def test_mysql_galera_cluster():
-    """Test MySQL/MariaDB Galera cluster generation."""
-    print("🔍 Testing MySQL/MariaDB Galera Cluster Template Engine")
-    print("=" * 60)
-
-    engine = MySQLTemplateEngine()
 
-    # Test Galera cluster context
-    context = TemplateContext(
+@pytest.fixture
+def galera_context():
+    """Context for a 3-node MariaDB Galera cluster behind ProxySQL."""
+    return TemplateContext(
         technology=["mariadb", "galera", "proxysql"],
         task_description="Deploy 3-node MariaDB Galera cluster with ProxySQL load balancer for high availability",
         specific_options=SpecificOptions(cluster_size=3),
         research_data={},
     )
 
-    # Check if engine can handle this context
-    can_handle = engine.can_handle(context)
-    print(f"Can handle context: {can_handle}")
-
-    if can_handle:
-        # Generate template
-        result = await engine.generate_template(context)
-
-        print(f"Template generated successfully!")
-        print(f"Confidence score: {result.confidence_score}")
-        print(f"Metadata: {result.metadata}")
-        print("\n" + "=" * 60)
-        print("Generated Template:")
-        print("=" * 60)
-        print(result.content[:2000] + "..." if len(result.content) > 2000 else result.content)
-    else:
-        print("❌ Engine cannot handle this context")
-
-
-async def test_mysql_basic():
-    """Test basic MySQL setup."""
-    print("\n🔍 Testing Basic MySQL Setup")
-    print("=" * 60)
-
-    engine = MySQLTemplateEngine()
 
-    context = TemplateContext(
+@pytest.fixture
+def basic_context():
+    """Context for a basic MySQL setup."""
+    return TemplateContext(
         technology=["mysql"],
         task_description="Set up MySQL database for web application",
         specific_options=SpecificOptions(),
         research_data={},
     )
 
-    can_handle = engine.can_handle(context)
-    print(f"Can handle context: {can_handle}")
 
-    if can_handle:
-        result = await engine.generate_template(context)
-        print(f"Template generated successfully!")
-        print(f"Confidence score: {result.confidence_score}")
-        print(f"Template length: {len(result.content)} characters")
+@pytest.mark.asyncio
+async def test_mysql_galera_cluster(engine, galera_context):
+    """Test MySQL/MariaDB Galera cluster generation."""
+    assert engine.can_handle(galera_context)
+
+    result = await engine.generate_template(galera_context)
+
+    assert result.template_type == "mysql_galera"
+    assert result.confidence_score > 0.5
+    assert "galera" in result.content.lower()
+    assert "proxysql" in result.content.lower()
+
 
+@pytest.mark.asyncio
+async def test_mysql_basic(engine, basic_context):
+    """Test basic MySQL setup."""
+    assert engine.can_handle(basic_context)
+
+    result = await engine.generate_template(basic_context)
 
-async def main():
-    """Run all tests."""
-    try:
-        await test_mysql_galera_cluster()
-        await test_mysql_basic()
-        print("\n✅ All tests completed successfully!")
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
+    assert result.template_type != "mysql_fallback"
+    assert result.confidence_score > 0.5
+    assert "mysql" in result.content.lower()
 
-        traceback.print_exc()
 
+@pytest.mark.asyncio
+async def test_mysql_templates_generate_concurrently(engine, galera_context, basic_context):
+    """Test that independent contexts can be generated concurrently on one engine."""
+    galera_result, basic_result = await asyncio.gather(
+        engine.generate_template(galera_context),
+        engine.generate_template(basic_context),
+    )
 
-if __name__ == "__main__":
-    asyncio.run(main())
+    assert galera_result.context_hash != basic_result.context_hash
+    assert all(
+        result.template_type.startswith("mysql_") for result in (galera_result, basic_result)
+    )
@@ -6,35 +6,46 @@ with the prompt generation system.
 """
 
 import json
+import logging
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
+from jinja2 import DictLoader
 
 from src.knowledge_manager import KnowledgeManager
 from src.prompt_config import PromptConfig
 from src.prompt_generator import PromptGenerator
 
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
 
-class TestTemplateSystem:
-    """Test template loading and rendering functionality."""
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def _write_json(path, data) -> None:
+    """Write fixture data as JSON with a single bytes write."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data))
+    else:
+        path.write_bytes(json.dumps(data).encode())
 
-    @pytest.fixture
-    def setup_template_environment(self, tmp_path):
-        """Create comprehensive template test environment."""
-        # Create directory structure
-        prompts_dir = tmp_path / "prompts"
-        prompts_dir.mkdir()
 
-        base_prompts_dir = prompts_dir / "base_prompts"
-        base_prompts_dir.mkdir()
+class TestTemplateSystem:
+    """Test template loading and rendering functionality."""
 
-        language_specific_dir = prompts_dir / "language_specific"
-        language_specific_dir.mkdir()
+    @pytest.fixture(scope="module")
+    def setup_template_environment(self, tmp_path_factory):
+        """
+        Create comprehensive template test environment shared by the module.
 
-        framework_specific_dir = prompts_dir / "framework_specific"
-        framework_specific_dir.mkdir()
+        Tests add their own templates to the in-memory ``templates`` mapping under
+        unique names, so they do not collide.
+        """
+        tmp_path = tmp_path_factory.mktemp("tpl")
 
         # Config setup
         config_dir = tmp_path / "config"
@@ -56,8 +67,7 @@ class TestTemplateSystem:
             },
         }
 
-        with open(config_file, "w") as f:
-            json.dump(config_data, f)
+        _write_json(config_file, config_data)
 
         # Knowledge base setup
         kb_dir = tmp_path / "knowledge_base"
@@ -110,42 +120,50 @@ def calculate_total(items):
         )
 
         # Tools files
-        with open(kb_tools_dir / "pytest.json", "w") as f:
-            json.dump(
-                {
-                    "name": "pytest",
-                    "description": "Python testing framework",
-                    "usage": "pytest tests/",
-                    "features": ["fixtures", "parametrization", "mocking"],
-                },
-                f,
-            )
-
-        with open(kb_tools_dir / "black.json", "w") as f:
-            json.dump(
-                {
-                    "name": "black",
-                    "description": "Python code formatter",
-                    "usage": "black src/",
-                    "features": ["automatic formatting", "PEP8 compliance"],
-                },
-                f,
-            )
+        _write_json(
+            kb_tools_dir / "pytest.json",
+            {
+                "name": "pytest",
+                "description": "Python testing framework",
+                "usage": "pytest tests/",
+                "features": ["fixtures", "parametrization", "mocking"],
+            },
+        )
+
+        _write_json(
+            kb_tools_dir / "black.json",
+            {
+                "name": "black",
+                "description": "Python code formatter",
+                "usage": "black src/",
+                "features": ["automatic formatting", "PEP8 compliance"],
+            },
+        )
 
         return {
-            "prompts_dir": str(prompts_dir),
+            # Templates are served from memory; tests register them by name
+            "templates": {},
             "config_file": str(config_file),
             "base_path": str(tmp_path),
         }
 
-    def test_basic_template_rendering(self, setup_template_environment):
+    @pytest.fixture(scope="module")
+    def generator(self, setup_template_environment):
+        """PromptGenerator rendering the in-memory templates of the shared environment."""
+        env = setup_template_environment
+        return PromptGenerator(
+            "",
+            env["config_file"],
+            base_path=env["base_path"],
+            loader=DictLoader(env["templates"]),
+        )
+
+    def test_basic_template_rendering(self, setup_template_environment, generator):
         """Test basic template rendering with simple substitution."""
         env = setup_template_environment
 
         # Create a simple template
-        template_file = Path(env["prompts_dir"]) / "base_prompts" / "simple.txt"
-        template_file.write_text(
-            """
+        simple_template = """
 You are a {{ role }} developer working with {{ technologies }}.
 
 Task: {{ task_description }}
@@ -161,11 +179,7 @@ Tools:
 - {{ tool.name }}: {{ tool.description }}
 {% endfor %}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/simple.txt"] = simple_template
 
         config = PromptConfig(
             technologies=["python"],
@@ -185,31 +199,21 @@ Tools:
         assert "pytest: Python testing framework" in prompt
         assert "black: Python code formatter" in prompt
 
-    def test_template_with_conditional_blocks(self, setup_template_environment):
+    def test_template_with_conditional_blocks(self, setup_template_environment, generator):
         """Test template rendering with conditional Jinja2 blocks."""
         env = setup_template_environment
 
+        # Guideline partials are picked per task type by the generator
+        for name in ("feature", "bugfix", "generic"):
+            env["templates"][f"guidelines/{name}.txt"] = (
+                PROMPTS_DIR / "guidelines" / f"{name}.txt"
+            ).read_text()
+
         # Create template with conditionals
-        template_file = Path(env["prompts_dir"]) / "base_prompts" / "conditional.txt"
-        template_file.write_text(
-            """
+        conditional_template = """
 Developer Profile: {{ role }} specializing in {{ technologies | join(', ') }}
 
-{% if task_type == "feature implementation" %}
-## Feature Development Guidelines
-- Follow test-driven development
-- Implement comprehensive error handling
-- Document API interfaces
-{% elif task_type == "bug fix" %}
-## Bug Fix Guidelines  
-- Identify root cause
-- Add regression tests
-- Verify fix doesn't break existing functionality
-{% else %}
-## General Development Guidelines
-- Follow coding standards
-- Write clean, maintainable code
-{% endif %}
+{% include guidelines_template %}
 
 {% if technologies | length > 1 %}
 ## Multi-Technology Integration
@@ -225,11 +229,7 @@ Task Details:
 Quality Requirements:
 {{ code_requirements | wordwrap(80) }}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/conditional.txt"] = conditional_template
 
         # Test feature implementation path
         config = PromptConfig(
@@ -249,14 +249,12 @@ Quality Requirements:
         assert "Real-Time Notifications System" in prompt  # title case
         assert "highly scalable" in prompt  # wordwrap preserves content
 
-    def test_template_with_filters_and_functions(self, setup_template_environment):
+    def test_template_with_filters_and_functions(self, setup_template_environment, generator):
         """Test template rendering with Jinja2 filters and functions."""
         env = setup_template_environment
 
         # Create template using various filters
-        template_file = Path(env["prompts_dir"]) / "base_prompts" / "advanced.txt"
-        template_file.write_text(
-            """
+        advanced_template = """
 # {{ task_type | title }} Development Guide
 
 Developer: {{ role | upper }}
@@ -281,20 +279,14 @@ Tools Available: {{ tech_tools.get(tech, []) | length }} tools configured
 {% endfor %}
 
 ## Implementation Checklist
-{% for i in range(1, 6) %}
-{{ i }}. Step {{ i }} of implementation
-{% endfor %}
+{{ checklist }}
 
 ## Generated Metadata
 - Timestamp: {{ timestamp | default('N/A') }}
 - Template: {{ template_name | basename }}
 - Config Hash: {{ config_hash | default('unknown') }}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/advanced.txt"] = advanced_template
 
         config = PromptConfig(
             technologies=["python", "react"],
@@ -317,14 +309,12 @@ Tools Available: {{ tech_tools.get(tech, []) | length }} tools configured
         assert "1. Step 1 of implementation" in prompt
         assert "5. Step 5 of implementation" in prompt
 
-    def test_template_inheritance_and_includes(self, setup_template_environment):
+    def test_template_inheritance_and_includes(self, setup_template_environment, generator):
         """Test Jinja2 template inheritance and include functionality."""
         env = setup_template_environment
 
         # Create base template
-        base_template = Path(env["prompts_dir"]) / "base.txt"
-        base_template.write_text(
-            """
+        base_template = """
 # {% block title %}Default Development Guide{% endblock %}
 
 ## Developer Information
@@ -338,24 +328,19 @@ Default content block
 ## Footer
 {% include 'footer.txt' %}
         """.strip()
-        )
+        env["templates"]["base.txt"] = base_template
 
         # Create footer include
-        footer_template = Path(env["prompts_dir"]) / "footer.txt"
-        footer_template.write_text(
-            """
+        footer_template = """
 ---
 Generated by Prompt Engineering System
 Template: {{ template_name }}
 Technologies: {{ technologies | length }} configured
         """.strip()
-        )
+        env["templates"]["footer.txt"] = footer_template
 
         # Create extending template
-        extended_template = Path(env["prompts_dir"]) / "language_specific" / "python_feature.txt"
-        extended_template.parent.mkdir(exist_ok=True)
-        extended_template.write_text(
-            """
+        python_feature_template = """
 {% extends "base.txt" %}
 
 {% block title %}Python Feature Development Guide{% endblock %}
@@ -389,11 +374,7 @@ Technologies: {{ technologies | length }} configured
 6. Update documentation
 {% endblock %}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["language_specific/python_feature.txt"] = python_feature_template
 
         config = PromptConfig(
             technologies=["python"],
@@ -415,14 +396,8 @@ Technologies: {{ technologies | length }} configured
         assert "Generated by Prompt Engineering System" in prompt  # Footer include
         assert "Technologies: 1 configured" in prompt  # Footer include with filter
 
-    def test_template_error_handling(self, setup_template_environment):
+    def test_template_error_handling(self, generator, caplog):
         """Test template error handling scenarios."""
-        env = setup_template_environment
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
-
         # Test missing template - should fallback to generic
         config = PromptConfig(
             technologies=["python"],
@@ -432,27 +407,23 @@ Technologies: {{ technologies | length }} configured
             template_name="non_existent_template.txt",
         )
 
-        with patch("src.prompt_generator.logger") as mock_logger:
+        with caplog.at_level(logging.WARNING, logger="src.prompt_generator"):
             prompt = generator.generate_prompt(config)
 
-            # Should fallback to generic template and log warning
-            mock_logger.warning.assert_called()
-            warning_msg = mock_logger.warning.call_args[0][0]
-            assert "Template not found" in warning_msg
-            assert "falling back to generic" in warning_msg
+        # Should fallback to generic template and log warning
+        assert "Template not found" in caplog.text
+        assert "falling back to generic" in caplog.text
 
-            # Should still generate a prompt
-            assert "expert developer" in prompt.lower()
-            assert "python" in prompt
+        # Should still generate a prompt
+        assert "expert developer" in prompt.lower()
+        assert "python" in prompt
 
-    def test_template_syntax_error_handling(self, setup_template_environment):
+    def test_template_syntax_error_handling(self, setup_template_environment, generator, caplog):
         """Test handling of templates with syntax errors."""
         env = setup_template_environment
 
         # Create template with syntax error
-        bad_template = Path(env["prompts_dir"]) / "base_prompts" / "syntax_error.txt"
-        bad_template.write_text(
-            """
+        syntax_error_template = """
 You are a {{ role }} developer.
 
 {% for practice in best_practices %}
@@ -461,12 +432,8 @@ You are a {{ role }} developer.
 
 {% if unclosed_block %}
 Some content
-        """.strip()
-        )  # Missing endif and closing }}
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        """.strip()  # Missing endif and closing }}
+        env["templates"]["base_prompts/syntax_error.txt"] = syntax_error_template
 
         config = PromptConfig(
             technologies=["python"],
@@ -477,25 +444,24 @@ Some content
         )
 
         # Should handle syntax error gracefully
-        with patch("src.prompt_generator.logger") as mock_logger:
+        with caplog.at_level(logging.WARNING, logger="src.prompt_generator"):
             prompt = generator.generate_prompt(config)
 
-            # Should log error and fallback
-            mock_logger.error.assert_called()
-            error_msg = mock_logger.error.call_args[0][0]
-            assert "Template rendering error" in error_msg
+        # Should log error and fallback
+        assert any(
+            record.levelno == logging.ERROR and "Template rendering error" in record.getMessage()
+            for record in caplog.records
+        )
 
-            # Should still produce output (fallback template)
-            assert len(prompt) > 0
+        # Should still produce output (fallback template)
+        assert len(prompt) > 0
 
-    def test_template_context_variables(self, setup_template_environment):
+    def test_template_context_variables(self, setup_template_environment, generator):
         """Test all available template context variables."""
         env = setup_template_environment
 
         # Create template that uses all context variables
-        comprehensive_template = Path(env["prompts_dir"]) / "base_prompts" / "context_test.txt"
-        comprehensive_template.write_text(
-            """
+        context_test_template = """
 # Template Context Test
 
 ## Basic Variables
@@ -542,11 +508,7 @@ Tools: {{ tech_tools.get(tech, []) }}
 - Length: {{ loop.length }}
 {% endfor %}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/context_test.txt"] = context_test_template
 
         config = PromptConfig(
             technologies=["python", "javascript"],
@@ -588,14 +550,12 @@ Tools: {{ tech_tools.get(tech, []) }}
         assert "Last: False" in prompt
         assert "Length: 2" in prompt
 
-    def test_template_with_missing_context_variables(self, setup_template_environment):
+    def test_template_with_missing_context_variables(self, setup_template_environment, generator):
         """Test template behavior with missing context variables."""
         env = setup_template_environment
 
         # Create template that references undefined variables
-        template_file = Path(env["prompts_dir"]) / "base_prompts" / "missing_vars.txt"
-        template_file.write_text(
-            """
+        missing_vars_template = """
 Role: {{ role }}
 Undefined Variable: {{ undefined_var }}
 Undefined with Default: {{ undefined_var | default('fallback_value') }}
@@ -611,11 +571,7 @@ Undefined condition handled
 Item: {{ item }}
 {% endfor %}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/missing_vars.txt"] = missing_vars_template
 
         config = PromptConfig(
             technologies=["python"],
@@ -639,14 +595,12 @@ Item: {{ item }}
         # The undefined_list should be empty, so no items should appear
         assert "Item:" not in prompt
 
-    def test_template_custom_filters(self, setup_template_environment):
+    def test_template_custom_filters(self, setup_template_environment, generator):
         """Test if custom Jinja2 filters work correctly."""
         env = setup_template_environment
 
         # Create template using various filters
-        template_file = Path(env["prompts_dir"]) / "base_prompts" / "filters.txt"
-        template_file.write_text(
-            """
+        filters_template = """
 # Filter Tests
 
 ## String Filters
@@ -673,11 +627,7 @@ Item: {{ item }}
 - Unique: {{ (technologies + technologies) | unique | list }}
 - Sort: {{ technologies | sort }}
         """.strip()
-        )
-
-        generator = PromptGenerator(
-            env["prompts_dir"], env["config_file"], base_path=env["base_path"]
-        )
+        env["templates"]["base_prompts/filters.txt"] = filters_template
 
         config = PromptConfig(
             technologies=["python", "javascript", "react"],
@@ -504,8 +504,7 @@ class TestEventSystemErrorHandling:
 
     def test_event_bus_history_overflow(self):
         """Test event bus history size management."""
-        event_bus = EventBus()
-        event_bus._max_history_size = 3  # Set small limit for testing
+        event_bus = EventBus(max_history_size=3)  # Set small limit for testing
 
         # Publish more events than the limit
         events = []
@@ -97,7 +97,7 @@ class TestEventBus:
         assert bus._handlers == {}
         assert bus._sync_handlers == {}
         assert bus._global_handlers == []
-        assert bus._event_history == []
+        assert list(bus._event_history) == []
         assert bus._max_history_size == 1000
 
     @pytest.mark.asyncio
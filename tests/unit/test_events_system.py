@@ -239,10 +239,9 @@ class TestEventBus:
         event_bus_instance.clear_history()
         assert len(event_bus_instance.get_event_history()) == 0
 
-    def test_event_history_size_limit(self, event_bus_instance):
+    def test_event_history_size_limit(self):
         """Test event history size limitation."""
-        # Simulate max history size of 1000 (default)
-        event_bus_instance._max_history_size = 3  # Set smaller for testing
+        event_bus_instance = EventBus(max_history_size=3)  # Smaller than default 1000
 
         # Publish more events than the limit
         for i in range(5):
@@ -259,6 +258,52 @@ class TestEventBus:
         assert "Source3" in sources
         assert "Source4" in sources
 
+    @pytest.mark.asyncio
+    async def test_publish_many_dispatches_batch(self):
+        """Test batch publishing reaches all handlers and respects history limit."""
+        event_bus_instance = EventBus(max_history_size=3)
+        received = []
+
+        async def typed_handler(event: Event):
+            received.append(("typed", event.source))
+
+        async def global_handler(event: Event):
+            received.append(("global", event.source))
+
+        def sync_handler(event: Event):
+            received.append(("sync", event.source))
+
+        event_bus_instance.subscribe(EventType.SYSTEM_ERROR, typed_handler)
+        event_bus_instance.subscribe_all(global_handler)
+        event_bus_instance.subscribe_sync(EventType.TEMPLATE_RENDERED, sync_handler)
+
+        events = [
+            Event(EventType.SYSTEM_ERROR, "Source0"),
+            Event(EventType.TEMPLATE_RENDERED, "Source1"),
+            Event(EventType.SYSTEM_ERROR, "Source2"),
+            Event(EventType.KNOWLEDGE_CACHE_HIT, "Source3"),
+        ]
+        await event_bus_instance.publish_many(events)
+
+        assert sorted(received) == sorted(
+            [
+                ("typed", "Source0"),
+                ("global", "Source0"),
+                ("global", "Source1"),
+                ("sync", "Source1"),
+                ("typed", "Source2"),
+                ("global", "Source2"),
+                ("global", "Source3"),
+            ]
+        )
+
+        # History keeps the most recent events in publish order
+        assert [event.source for event in event_bus_instance.get_event_history()] == [
+            "Source1",
+            "Source2",
+            "Source3",
+        ]
+
     def test_unsubscribe_handlers(self, event_bus_instance):
         """Test unsubscribing event handlers."""
         received_events = []
@@ -292,6 +337,28 @@ class TestEventBus:
         result = event_bus_instance.unsubscribe(EventType.PROMPT_GENERATION_FAILED, async_handler)
         assert result is False
 
+    def test_reset_removes_handlers_and_history(self, event_bus_instance):
+        """Test reset returns the bus to a freshly constructed state."""
+        received_events = []
+
+        async def async_handler(event: Event):
+            received_events.append("async")
+
+        def sync_handler(event: Event):
+            received_events.append("sync")
+
+        event_bus_instance.subscribe(EventType.SYSTEM_ERROR, async_handler)
+        event_bus_instance.subscribe_sync(EventType.SYSTEM_ERROR, sync_handler)
+        event_bus_instance.subscribe_all(async_handler)
+        asyncio.run(event_bus_instance.publish(Event(EventType.SYSTEM_ERROR, "TestSource")))
+
+        event_bus_instance.reset()
+        received_events.clear()
+        asyncio.run(event_bus_instance.publish(Event(EventType.SYSTEM_ERROR, "TestSource")))
+
+        assert received_events == []
+        assert len(event_bus_instance.get_event_history()) == 1
+
     @pytest.mark.asyncio
     async def test_handler_error_handling(self, event_bus_instance):
         """Test error handling in event handlers."""
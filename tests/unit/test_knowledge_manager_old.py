@@ -1,44 +1,64 @@
 import json
 import os
+from pathlib import Path
 
 import pytest
 
 import src.utils
-from src.knowledge_manager import KnowledgeManager
+from src.knowledge_manager import KnowledgeManager, _summarize_markdown
 from src.utils import safe_path_join
 
+CONFIG_DATA = {
+    "python": {"best_practices": ["PEP8"], "tools": ["Pylint"]},
+    "javascript": {"best_practices": ["ESLint Recommended"], "tools": ["Jest"]},
+    "docker": {"best_practices": ["Docker Best Practices"], "tools": ["Docker"]},
+}
+
+KB_BEST_PRACTICES = {
+    "pep8.md": "PEP8 details",
+    "docker_best_practices.md": "Docker BP details",
+}
+
+KB_TOOLS = {
+    "pylint.json": {"name": "Pylint", "description": "Pylint tool"},
+    "docker.json": {"name": "Docker", "description": "Docker tool"},
+}
+
+# Serialized once so the fixture only has to write bytes
+_KB_BEST_PRACTICE_BYTES = {name: text.encode() for name, text in KB_BEST_PRACTICES.items()}
+_KB_TOOL_BYTES = {name: json.dumps(data).encode() for name, data in KB_TOOLS.items()}
+
 
 # Setup for tests
-@pytest.fixture
-def setup_knowledge_base(tmp_path, mocker):
-    # Create dummy config file
-    config_dir = tmp_path / "config"
-    config_dir.mkdir()
-    config_file = config_dir / "tech_stack_mapping.json"
-    config_data = {
-        "python": {"best_practices": ["PEP8"], "tools": ["Pylint"]},
-        "javascript": {"best_practices": ["ESLint Recommended"], "tools": ["Jest"]},
-        "docker": {"best_practices": ["Docker Best Practices"], "tools": ["Docker"]},
-    }
-    with open(config_file, "w") as f:
-        json.dump(config_data, f)
+@pytest.fixture(scope="module")
+def knowledge_base_files(tmp_path_factory):
+    """Write the knowledge base files once for the whole module."""
+    tmp_path = tmp_path_factory.mktemp("kb")
+
+    # The mapping itself is served by the mocked _load_tech_stack_mapping,
+    # so the config path is never read and the file is not written
+    config_file = tmp_path / "config" / "tech_stack_mapping.json"
 
     # Create dummy knowledge base files
-    kb_bp_dir = tmp_path / "knowledge_base" / "best_practices"
-    kb_bp_dir.mkdir(parents=True)
-    (kb_bp_dir / "pep8.md").write_text("PEP8 details")
-    (kb_bp_dir / "docker_best_practices.md").write_text("Docker BP details")
-
-    kb_tools_dir = tmp_path / "knowledge_base" / "tools"
-    kb_tools_dir.mkdir(parents=True)
-    with open(kb_tools_dir / "pylint.json", "w") as f:
-        json.dump({"name": "Pylint", "description": "Pylint tool"}, f)
-    with open(kb_tools_dir / "docker.json", "w") as f:
-        json.dump({"name": "Docker", "description": "Docker tool"}, f)
+    for subdir, files in (
+        ("best_practices", _KB_BEST_PRACTICE_BYTES),
+        ("tools", _KB_TOOL_BYTES),
+    ):
+        kb_dir = tmp_path / "knowledge_base" / subdir
+        kb_dir.mkdir(parents=True)
+        for name, content in files.items():
+            (kb_dir / name).write_bytes(content)
+
+    return config_file, tmp_path
+
+
+@pytest.fixture
+def setup_knowledge_base(knowledge_base_files, mocker):
+    config_file, base_path = knowledge_base_files
 
     # Mock the internal _load_tech_stack_mapping method of KnowledgeManager
     # This allows us to control the initial state without actual file I/O during __init__
-    mocker.patch.object(KnowledgeManager, "_load_tech_stack_mapping", return_value=config_data)
+    mocker.patch.object(KnowledgeManager, "_load_tech_stack_mapping", return_value=CONFIG_DATA)
 
     # Mock the underlying file read functions to count calls for caching test
     mock_read_text_file = mocker.patch("src.knowledge_manager.read_text_file")
@@ -46,26 +66,22 @@ def setup_knowledge_base(tmp_path, mocker):
 
     # Configure mocks to return dummy data when called, or raise FileNotFoundError for missing files
     def mock_read_text_side_effect(path):
-        if "pep8.md" in path:
-            return "PEP8 details"
-        elif "docker_best_practices.md" in path:
-            return "Docker BP details"
-        else:
-            raise FileNotFoundError(f"File not found: {path}")
+        try:
+            return KB_BEST_PRACTICES[os.path.basename(path)]
+        except KeyError:
+            raise FileNotFoundError(f"File not found: {path}") from None
 
     def mock_load_json_side_effect(path):
-        if "pylint.json" in path:
-            return {"name": "Pylint", "description": "Pylint tool"}
-        elif "docker.json" in path:
-            return {"name": "Docker", "description": "Docker tool"}
-        else:
-            raise FileNotFoundError(f"File not found: {path}")
+        try:
+            return dict(KB_TOOLS[os.path.basename(path)])
+        except KeyError:
+            raise FileNotFoundError(f"File not found: {path}") from None
 
     mock_read_text_file.side_effect = mock_read_text_side_effect
     mock_load_json_file.side_effect = mock_load_json_side_effect
 
     # Instantiate KnowledgeManager after mocks are set up
-    km = KnowledgeManager(str(config_file), base_path=str(tmp_path))
+    km = KnowledgeManager(str(config_file), base_path=str(base_path))
 
     return km, mock_read_text_file, mock_load_json_file
 
@@ -124,6 +140,103 @@ def test_knowledge_manager_caching(setup_knowledge_base):
     mock_load_json_file.assert_not_called()
 
 
+def test_knowledge_files_shared_across_managers(setup_knowledge_base):
+    km, mock_read_text_file, _ = setup_knowledge_base
+    base_path = km.knowledge_base_root
+    second_km = KnowledgeManager(km.config_path, base_path=base_path)
+
+    km.get_best_practice_details("PEP8")
+    second_km.get_best_practice_details("PEP8")
+    mock_read_text_file.assert_called_once()
+
+    # A modified file is reloaded even though its path is already cached
+    pep8_path = Path(base_path) / "knowledge_base" / "best_practices" / "pep8.md"
+    stat = pep8_path.stat()
+    os.utime(pep8_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    third_km = KnowledgeManager(km.config_path, base_path=base_path)
+    third_km.get_best_practice_details("PEP8")
+    assert mock_read_text_file.call_count == 2
+
+
+def test_shared_knowledge_files_are_private_per_manager(setup_knowledge_base):
+    km, _, mock_load_json_file = setup_knowledge_base
+    second_km = KnowledgeManager(km.config_path, base_path=km.knowledge_base_root)
+
+    km.get_tool_details("Pylint")["description"] = "Changed"
+    assert second_km.get_tool_details("Pylint")["description"] == "Pylint tool"
+    mock_load_json_file.assert_called_once()
+
+
+def test_repeated_lookups_skip_path_resolution(setup_knowledge_base, mocker):
+    km, _, _ = setup_knowledge_base
+    km.get_best_practice_details("PEP8")
+    km.get_tool_details("Pylint")
+
+    mock_join = mocker.patch("src.knowledge_manager.safe_path_join")
+    assert km.get_best_practice_details("PEP8") is not None
+    assert km.get_tool_details("Pylint") is not None
+    mock_join.assert_not_called()
+
+
+def test_preload_fills_cache(setup_knowledge_base):
+    km, mock_read_text_file, mock_load_json_file = setup_knowledge_base
+
+    km.preload(["PEP8", "Docker Best Practices", "Non Existent BP"], ["Pylint", "Docker"])
+    assert mock_read_text_file.call_count == 2
+    assert mock_load_json_file.call_count == 2
+
+    mock_read_text_file.reset_mock()
+    mock_load_json_file.reset_mock()
+    assert km.get_best_practice_details("Docker Best Practices") == "Docker BP details"
+    assert km.get_tool_details("Docker")["name"] == "Docker"
+    mock_read_text_file.assert_not_called()
+    mock_load_json_file.assert_not_called()
+
+
+def test_preload_leaves_missing_files_to_lookup(setup_knowledge_base, caplog):
+    km, mock_read_text_file, _ = setup_knowledge_base
+
+    km.preload(["PEP8", "Non Existent BP"], [])
+    assert km.get_best_practice_details("Non Existent BP") is None
+
+    missing_reads = [
+        call for call in mock_read_text_file.call_args_list if "non_existent_bp" in call.args[0]
+    ]
+    assert len(missing_reads) == 1
+    assert len([r for r in caplog.records if "Non Existent BP" in r.getMessage()]) == 1
+
+
+def test_get_best_practice_summary(setup_knowledge_base):
+    km, mock_read_text_file, _ = setup_knowledge_base
+    assert km.get_best_practice_summary("PEP8") == "PEP8 details"
+    assert km.get_best_practice_details("PEP8") == "PEP8 details"
+    mock_read_text_file.assert_called_once()
+    assert km.get_best_practice_summary("Non Existent BP") is None
+
+
+def test_summarize_markdown():
+    text = "# Clean Code\n\nCode that is easy to read.\n\n## Key Principles:\n* Names"
+    assert _summarize_markdown(text) == "# Clean Code\nCode that is easy to read."
+    assert _summarize_markdown("# Title only\n") == "# Title only"
+    assert _summarize_markdown("") == ""
+
+
+def test_tech_stack_mapping_parsed_once(tmp_path, mocker):
+    config_file = tmp_path / "tech_stack_mapping.json"
+    config_file.write_text(json.dumps({"python": {"best_practices": ["PEP8"], "tools": []}}))
+    load_json = mocker.patch("src.knowledge_manager.load_json_file", wraps=src.utils.load_json_file)
+
+    first = KnowledgeManager(str(config_file), base_path=str(tmp_path))
+    second = KnowledgeManager(str(config_file), base_path=str(tmp_path))
+
+    assert first.get_best_practices("python") == second.get_best_practices("python") == ["PEP8"]
+    load_json.assert_called_once()
+
+    first.get_best_practices("python").append("Changed")
+    assert second.get_best_practices("python") == ["PEP8"]
+
+
 def test_safe_path_join_prevention(tmp_path):
     base_dir = str(tmp_path)
     # Attempt to traverse outside base_dir
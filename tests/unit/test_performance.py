@@ -24,7 +24,8 @@ from src.performance import (
     async_read_text_file,
     async_load_json_file,
     LazyEvaluator,
-    lazy
+    lazy,
+    DURATION_HISTORY_SIZE,
 )
 from src.result_types import Success, Error, KnowledgeError
 
@@ -152,6 +153,17 @@ class TestPerformanceTracker:
         assert metrics.execution_time == 2.5
         assert metrics.memory_usage_mb == 2.0  # 3.0 - 1.0 = 2MB increase
 
+    def test_stop_tracking_with_measured_duration(self, tracker):
+        """Test a caller-measured duration replaces the float timer."""
+        with patch.object(tracker, '_get_memory_usage', return_value=1.0):
+            tracker.start_tracking("measured_op")
+
+        with patch('time.perf_counter', side_effect=AssertionError("float timer used")):
+            metrics = tracker.stop_tracking("measured_op", 1_500_000_000)
+
+        assert metrics.execution_time == 1.5
+        assert tracker.get_recent_durations("measured_op") == []
+
     def test_stop_tracking_nonexistent_operation(self, tracker):
         """Test stopping tracking for non-existent operation raises error."""
         with pytest.raises(ValueError, match="No tracking started for operation: nonexistent"):
@@ -205,6 +217,38 @@ class TestPerformanceTracker:
         
         assert "nonexistent" not in tracker._metrics
 
+    def test_record_duration_is_bounded(self, tracker):
+        """Test duration history keeps only the most recent samples."""
+        for duration_ns in range(DURATION_HISTORY_SIZE + 10):
+            tracker.record_duration("bounded_test", duration_ns)
+
+        durations = tracker.get_recent_durations("bounded_test")
+        assert len(durations) == DURATION_HISTORY_SIZE
+        assert durations[0] == 10 / 1e9
+        assert tracker.get_recent_durations("unknown") == []
+
+    def test_reset_clears_metrics(self, tracker):
+        """Test reset discards all tracked operations."""
+        with patch.object(tracker, '_get_memory_usage', return_value=1.0):
+            tracker.start_tracking("reset_test")
+
+        tracker.reset()
+
+        assert tracker._metrics == {}
+        with pytest.raises(ValueError):
+            tracker.stop_tracking("reset_test")
+
+    def test_reset_empties_held_duration_history(self, tracker):
+        """Test reset clears duration histories in place for holders of the deque."""
+        history = tracker.duration_history("held_test")
+        tracker.record_duration("held_test", 5)
+
+        tracker.reset()
+
+        assert len(history) == 0
+        history.append(7)
+        assert tracker.get_recent_durations("held_test") == [7 / 1e9]
+
 
 class TestMonitorPerformanceDecorator:
     """Test monitor_performance decorator functionality."""
@@ -239,6 +283,31 @@ class TestMonitorPerformanceDecorator:
         result = await my_test_function()
         assert result == "test_result"
 
+    def test_decorator_records_duration(self):
+        """Test decorator records call duration in the global tracker."""
+        @monitor_performance("duration_record_test")
+        def timed_function():
+            time.sleep(0.01)
+
+        performance_tracker.duration_history("duration_record_test").clear()
+        timed_function()
+
+        durations = performance_tracker.get_recent_durations("duration_record_test")
+        assert len(durations) == 1
+        assert durations[0] >= 0.01
+
+    def test_decorator_records_duration_after_reset(self):
+        """Test the history bound at decoration time stays attached across reset."""
+        @monitor_performance("duration_reset_test")
+        def timed_function():
+            return None
+
+        timed_function()
+        performance_tracker.reset()
+        timed_function()
+
+        assert len(performance_tracker.get_recent_durations("duration_reset_test")) == 1
+
     def test_decorator_handles_sync_exceptions(self):
         """Test decorator properly handles exceptions in sync functions."""
         @monitor_performance("sync_error_test")
@@ -1,16 +1,45 @@
 import json
+import logging
 import os
 
 import pytest
+from jinja2 import ChoiceLoader, DictLoader, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.sandbox import SandboxedEnvironment
 
 from src.knowledge_manager import KnowledgeManager
 from src.prompt_config import PromptConfig
-from src.prompt_generator import PromptGenerator
+from src.prompt_generator import BYTECODE_CACHE_ENV, PromptGenerator
+
+KB_BEST_PRACTICES = {
+    "pep8.md": b"PEP8 details",
+    "clean_code_principles.md": b"Clean Code details",
+    "eslint_recommended.md": b"ESLint Recommended details",
+    "react_best_practices.md": b"React Best Practices details",
+}
+
+KB_TOOLS = {
+    f"{name.lower()}.json": json.dumps({"name": name, "description": description}).encode()
+    for name, description in (
+        ("Pylint", "Pylint tool"),
+        ("Black", "Black tool"),
+        ("Jest", "Jest tool"),
+        ("ESLint", "ESLint tool"),
+        ("ESLint-plugin-react", "ESLint React tool"),
+    )
+}
 
 
 # Setup for tests
-@pytest.fixture
-def setup_generator(tmp_path):
+@pytest.fixture(scope="module")
+def setup_generator(tmp_path_factory):
+    """
+    Build the config, knowledge base and prompts layout once per module.
+
+    Tests must treat these files as read-only; tests needing different
+    templates pass their own loader instead.
+    """
+    tmp_path = tmp_path_factory.mktemp("generator")
+
     # Create dummy config file
     config_dir = tmp_path / "config"
     config_dir.mkdir()
@@ -27,25 +56,11 @@ def setup_generator(tmp_path):
         json.dump(config_data, f)
 
     # Create dummy knowledge base files
-    kb_bp_dir = tmp_path / "knowledge_base" / "best_practices"
-    kb_bp_dir.mkdir(parents=True)
-    (kb_bp_dir / "pep8.md").write_text("PEP8 details")
-    (kb_bp_dir / "clean_code_principles.md").write_text("Clean Code details")
-    (kb_bp_dir / "eslint_recommended.md").write_text("ESLint Recommended details")
-    (kb_bp_dir / "react_best_practices.md").write_text("React Best Practices details")
-
-    kb_tools_dir = tmp_path / "knowledge_base" / "tools"
-    kb_tools_dir.mkdir(parents=True)
-    with open(kb_tools_dir / "pylint.json", "w") as f:
-        json.dump({"name": "Pylint", "description": "Pylint tool"}, f)
-    with open(kb_tools_dir / "black.json", "w") as f:
-        json.dump({"name": "Black", "description": "Black tool"}, f)
-    with open(kb_tools_dir / "jest.json", "w") as f:
-        json.dump({"name": "Jest", "description": "Jest tool"}, f)
-    with open(kb_tools_dir / "eslint.json", "w") as f:
-        json.dump({"name": "ESLint", "description": "ESLint tool"}, f)
-    with open(kb_tools_dir / "eslint-plugin-react.json", "w") as f:
-        json.dump({"name": "ESLint-plugin-react", "description": "ESLint React tool"}, f)
+    for subdir, files in (("best_practices", KB_BEST_PRACTICES), ("tools", KB_TOOLS)):
+        kb_dir = tmp_path / "knowledge_base" / subdir
+        kb_dir.mkdir(parents=True)
+        for name, content in files.items():
+            (kb_dir / name).write_bytes(content)
 
     # Create dummy prompt templates
     prompts_dir = tmp_path / "prompts"
@@ -68,79 +83,83 @@ def setup_generator(tmp_path):
     return str(prompts_dir), str(config_file)
 
 
-def test_prompt_generator_generic_prompt(setup_generator):
-    prompts_dir, config_path = setup_generator
-    generator = PromptGenerator(prompts_dir, config_path)
-
-    config = PromptConfig(
-        technologies=["python"],
-        task_type="nuova funzionalità",
-        task_description="un modulo di utilità",
-        code_requirements="Il codice deve essere pulito e ben commentato.",
-        template_name="base_prompts/generic_code_prompt.txt",
-    )
-
-    prompt = generator.generate_prompt(config)
-
-    assert "Come sviluppatore esperto in python" in prompt
-    assert "nuova funzionalità" in prompt
-    assert "PEP8 details" in prompt  # Check for detailed best practice
-    assert "Pylint tool" in prompt  # Check for detailed tool
-    assert "Il codice deve essere pulito e ben commentato." in prompt
-
-
-def test_prompt_generator_python_feature_prompt(setup_generator):
-    prompts_dir, config_path = setup_generator
-    generator = PromptGenerator(prompts_dir, config_path)
-
-    config = PromptConfig(
-        technologies=["python"],
-        task_type="funzionalità",
-        task_description="un endpoint API",
-        code_requirements="Deve essere RESTful.",
-        template_name="language_specific/python/feature_prompt.txt",
-    )
-
-    prompt = generator.generate_prompt(config)
-
-    assert (
-        "Come sviluppatore Python esperto, implementa la seguente funzionalità: un endpoint API."
-        in prompt
-    )
-    assert "PEP8 details" in prompt
-    assert "Pylint tool" in prompt
-    assert (
-        "Il codice deve essere: Deve essere RESTful.. Includi docstring e type hints appropriati."
-        in prompt
-    )
-
-
-def test_prompt_generator_react_component_prompt(setup_generator):
+TEMPLATE_CASES = [
+    pytest.param(
+        "base_prompts/generic_code_prompt.txt",
+        ["python"],
+        "nuova funzionalità",
+        "un modulo di utilità",
+        "Il codice deve essere pulito e ben commentato.",
+        [
+            "Come sviluppatore esperto in python",
+            "nuova funzionalità",
+            "PEP8 details",  # Check for detailed best practice
+            "Pylint tool",  # Check for detailed tool
+            "Il codice deve essere pulito e ben commentato.",
+        ],
+        id="generic",
+    ),
+    pytest.param(
+        "language_specific/python/feature_prompt.txt",
+        ["python"],
+        "funzionalità",
+        "un endpoint API",
+        "Deve essere RESTful.",
+        [
+            "Come sviluppatore Python esperto, implementa la seguente funzionalità: un endpoint API.",
+            "PEP8 details",
+            "Pylint tool",
+            "Il codice deve essere: Deve essere RESTful.. Includi docstring e type hints appropriati.",
+        ],
+        id="python_feature",
+    ),
+    pytest.param(
+        "framework_specific/react/component_prompt.txt",
+        ["javascript", "react"],
+        "componente UI",
+        "un bottone riutilizzabile",
+        "Deve essere accessibile.",
+        [
+            "Come sviluppatore React esperto, crea il seguente componente UI: un bottone riutilizzabile.",
+            "ESLint Recommended details",
+            "React Best Practices details",
+            "Jest tool",
+            "Description: ESLint React tool",  # Check for ESLint-plugin-react tool
+            "Il componente deve essere: Deve essere accessibile.. Includi test unitari con Jest e React Testing Library.",
+        ],
+        id="react_component",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "template_name,technologies,task_type,task_description,code_requirements,expected",
+    TEMPLATE_CASES,
+)
+def test_prompt_generator_template_prompts(
+    setup_generator,
+    template_name,
+    technologies,
+    task_type,
+    task_description,
+    code_requirements,
+    expected,
+):
     prompts_dir, config_path = setup_generator
     generator = PromptGenerator(prompts_dir, config_path)
 
     config = PromptConfig(
-        technologies=["javascript", "react"],
-        task_type="componente UI",
-        task_description="un bottone riutilizzabile",
-        code_requirements="Deve essere accessibile.",
-        template_name="framework_specific/react/component_prompt.txt",
+        technologies=technologies,
+        task_type=task_type,
+        task_description=task_description,
+        code_requirements=code_requirements,
+        template_name=template_name,
     )
 
     prompt = generator.generate_prompt(config)
 
-    assert (
-        "Come sviluppatore React esperto, crea il seguente componente UI: un bottone riutilizzabile."
-        in prompt
-    )
-    assert "ESLint Recommended details" in prompt
-    assert "React Best Practices details" in prompt
-    assert "Jest tool" in prompt
-    assert "Description: ESLint React tool" in prompt  # Check for ESLint-plugin-react tool
-    assert (
-        "Il componente deve essere: Deve essere accessibile.. Includi test unitari con Jest e React Testing Library."
-        in prompt
-    )
+    for substring in expected:
+        assert substring in prompt
 
 
 def test_prompt_generator_empty_technologies(setup_generator):
@@ -201,7 +220,7 @@ def test_prompt_config_validation():
         task_type="valid task type",
         code_requirements="detailed code requirements that meet minimum length",
     )
-    assert config.technologies == ["python", "docker"]
+    assert config.technologies == ("python", "docker")
     assert config.task_type == "valid task type"
 
 
@@ -222,3 +241,254 @@ def test_prompt_generator_legacy_method(setup_generator):
     assert "Come sviluppatore esperto in python" in prompt
     assert "legacy test task" in prompt
     assert "PEP8 details" in prompt
+
+
+def test_prompt_generator_shares_environment(setup_generator):
+    prompts_dir, config_path = setup_generator
+    first = PromptGenerator(prompts_dir, config_path)
+    second = PromptGenerator(prompts_dir, config_path)
+
+    assert first.env is second.env
+    assert "tojsonpretty" in first.env.filters
+
+
+def test_prompt_generator_with_custom_loader(setup_generator):
+    _, config_path = setup_generator
+    loader = DictLoader({"base_prompts/generic_code_prompt.txt": "Tech: {{ technologies_list }}"})
+    generator = PromptGenerator("", config_path, loader=loader)
+
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="in-memory template",
+        code_requirements="rendered without touching the prompts directory",
+    )
+
+    assert generator.generate_prompt(config) == "Tech: python"
+
+
+def test_prompt_generator_with_bytecode_cache(setup_generator, tmp_path):
+    prompts_dir, config_path = setup_generator
+    cache_dir = tmp_path / "jinja_cache"
+    cache_dir.mkdir()
+    bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+
+    generator = PromptGenerator(prompts_dir, config_path, bytecode_cache=bytecode_cache)
+
+    assert generator.env is not PromptGenerator(prompts_dir, config_path).env
+    assert generator.env.bytecode_cache is bytecode_cache
+    assert "tojsonpretty" in generator.env.filters
+
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="bytecode cached template",
+        code_requirements="compiled template stored in the bytecode cache",
+    )
+    generator.generate_prompt(config)
+
+    assert any(cache_dir.iterdir())
+
+
+def test_prompt_generator_sandboxed(setup_generator):
+    prompts_dir, config_path = setup_generator
+    generator = PromptGenerator(prompts_dir, config_path, sandboxed=True)
+
+    assert isinstance(generator.env, SandboxedEnvironment)
+    assert not isinstance(PromptGenerator(prompts_dir, config_path).env, SandboxedEnvironment)
+
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="sandboxed render",
+        code_requirements="templates render normally inside the sandbox",
+    )
+
+    assert "sandboxed render" in generator.generate_prompt(config)
+
+
+def test_prompt_generator_serves_cached_template_without_reload(setup_generator):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader({"base_prompts/generic_code_prompt.txt": "Tech: {{ technologies_list }}"})
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+
+    assert generator.env.auto_reload is False
+
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="cached template",
+        code_requirements="compiled once and reused for later renders",
+    )
+    first = generator.generate_prompt(config)
+    loader.mapping["base_prompts/generic_code_prompt.txt"] = "Changed"
+
+    assert generator.generate_prompt(config) == first
+
+
+def test_prompt_generator_reuses_tech_context(setup_generator, mocker):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader(
+        {"base_prompts/generic_code_prompt.txt": "{{ primary_tech }}: {{ task_type }}"}
+    )
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    collect = mocker.spy(generator, "_collect_technology_data")
+
+    first = PromptConfig(
+        technologies=["python", "docker"],
+        task_type="first task",
+        code_requirements="context built once per technology set",
+    )
+    second = PromptConfig(
+        technologies=["docker", "python"],
+        task_type="second task",
+        code_requirements="context built once per technology set",
+    )
+
+    assert generator.generate_prompt(first) == "python: first task"
+    assert generator.generate_prompt(second) == "docker: second task"
+    collect.assert_called_once()
+
+
+def test_prompt_generator_chains_missing_variables(setup_generator):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader(
+        {
+            "base_prompts/generic_code_prompt.txt": (
+                "Missing: {{ missing_dict.key | default('fallback') }}"
+            )
+        }
+    )
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="missing variables",
+        code_requirements="undefined lookups fall back to their defaults",
+    )
+
+    assert generator.generate_prompt(config) == "Missing: fallback"
+
+
+def test_prompt_generator_missing_template_warns_and_falls_back(setup_generator, caplog):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader({"base_prompts/generic_code_prompt.txt": "Generic: {{ task_type }}"})
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="fallback",
+        code_requirements="missing templates use the generic prompt",
+        template_name="non_existent_template.txt",
+    )
+
+    with caplog.at_level(logging.WARNING, logger="src.prompt_generator"):
+        assert generator.generate_prompt(config) == "Generic: fallback"
+
+    assert "Template not found: non_existent_template.txt" in caplog.text
+
+
+def test_prompt_generator_reuses_rendered_prompt(setup_generator, mocker):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader({"base_prompts/generic_code_prompt.txt": "{{ task_type }}"})
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    render = mocker.spy(generator, "_render_template")
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="rendered once",
+        code_requirements="identical configs reuse the rendered prompt",
+    )
+
+    assert generator.generate_prompt(config) == "rendered once"
+    assert generator.generate_prompt(config) == "rendered once"
+    render.assert_called_once()
+
+
+def test_shared_environment_uses_bytecode_cache(setup_generator):
+    prompts_dir, config_path = setup_generator
+    generator = PromptGenerator(prompts_dir, config_path)
+
+    cache = generator.env.bytecode_cache
+    assert isinstance(cache, FileSystemBytecodeCache)
+    assert cache.directory == os.environ[BYTECODE_CACHE_ENV]
+
+
+def test_prompt_generator_stream_prompt_matches_generate(setup_generator):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader(
+        {
+            "base_prompts/generic_code_prompt.txt": (
+                "Task: {{ task_type }}\n{% for tool in tools_list %}- {{ tool }}\n{% endfor %}"
+            )
+        }
+    )
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="streaming",
+        code_requirements="chunks join to the rendered prompt",
+    )
+
+    chunks = list(generator.stream_prompt(config))
+    assert len(chunks) > 1
+    assert "".join(chunks) == generator.generate_prompt(config)
+    assert list(generator.stream_prompt(config)) == [generator.generate_prompt(config)]
+
+
+@pytest.mark.parametrize(
+    "task_type, heading",
+    [
+        ("feature implementation", "## Feature Development Guidelines"),
+        ("bug fix", "## Bug Fix Guidelines"),
+        ("code review", "## General Development Guidelines"),
+    ],
+)
+def test_prompt_generator_selects_guidelines_by_task_type(setup_generator, task_type, heading):
+    prompts_dir, config_path = setup_generator
+    repo_prompts = os.path.join(os.path.dirname(__file__), "..", "..", "prompts")
+    loader = ChoiceLoader(
+        [
+            DictLoader(
+                {"base_prompts/generic_code_prompt.txt": "{% include guidelines_template %}"}
+            ),
+            FileSystemLoader(repo_prompts),
+        ]
+    )
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type=task_type,
+        code_requirements="guidelines follow the task type",
+    )
+
+    assert generator.generate_prompt(config).startswith(heading)
+
+
+def test_prompt_generator_exposes_template_snippets(setup_generator):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader({"base_prompts/generic_code_prompt.txt": "{{ checklist }}"})
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="checklist",
+        code_requirements="invariant blocks come from snippets",
+    )
+
+    prompt = generator.generate_prompt(config)
+    assert prompt.splitlines()[0] == "1. Step 1 of implementation"
+    assert prompt.splitlines()[-1] == "5. Step 5 of implementation"
+
+
+def test_prompt_generator_prebuilt_bullet_lists(setup_generator):
+    prompts_dir, config_path = setup_generator
+    loader = DictLoader(
+        {
+            "base_prompts/generic_code_prompt.txt": (
+                "{{ best_practices_rendered }}\n{{ tools_rendered }}"
+            )
+        }
+    )
+    generator = PromptGenerator(prompts_dir, config_path, loader=loader)
+    config = PromptConfig(
+        technologies=["python"],
+        task_type="bullet lists",
+        code_requirements="lists are joined outside the template",
+    )
+
+    assert generator.generate_prompt(config) == (
+        "- Clean Code Principles\n- PEP8\n- **Black**\n- **Pylint**"
+    )
@@ -71,6 +71,19 @@ class TestSafePathJoin:
         with pytest.raises(ValueError, match="Attempted directory traversal"):
             safe_path_join(base_dir, "subdir", "..", "..", "..", "etc", "passwd")
 
+    def test_safe_path_join_prevents_sibling_prefix_escape(self):
+        """Test safe path joining rejects siblings that share the base name as a prefix."""
+        base_dir = "/home/user/project"
+
+        with pytest.raises(ValueError, match="Attempted directory traversal"):
+            safe_path_join(base_dir, "..", "project_secrets", "keys.txt")
+
+    def test_safe_path_join_allows_base_dir_itself(self):
+        """Test safe path joining allows resolving to the base directory."""
+        base_dir = "/home/user/project"
+
+        assert safe_path_join(base_dir, "subdir", "..") == os.path.abspath(base_dir)
+
     def test_safe_path_join_allows_same_level_access(self):
         """Test safe path joining allows same-level directory access."""
         base_dir = "/home/user/project"
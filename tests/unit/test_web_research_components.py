@@ -15,7 +15,8 @@ from pathlib import Path
 from src.web_research.technology_detector import TechnologyDetector, TechnologyKnowledge, SimilarityResult
 from src.web_research.web_researcher import WebResearcher, ResearchSession, ResearchProgress
 from src.web_research.template_generator import DynamicTemplateGenerator, TemplateSection, CodeExample
-from src.web_research.config import WebResearchConfig, TemplateConfig
+from src.web_research.config import SearchProviderConfig, WebResearchConfig, TemplateConfig
+from src.web_research.search_providers import DuckDuckGoSearchProvider
 from src.web_research.interfaces import (
     ITechnologyDetector, IWebResearcher, IDynamicTemplateGenerator,
     TechnologyProfile, ResearchResult, SearchResult, ResearchQuality
@@ -474,6 +475,27 @@ class TestDynamicTemplateGeneratorPublicBehavior:
         assert isinstance(template, str)
 
 
+class TestSearchProviderRelevance:
+    """Test relevance scoring shared by the search providers."""
+
+    @pytest.fixture
+    def provider(self):
+        """Search provider used only for its scoring helper."""
+        return DuckDuckGoSearchProvider(SearchProviderConfig(provider_type="duckduckgo"))
+
+    def test_relevance_score_word_matches(self, provider):
+        """Test that each query word found in title or snippet adds to the score."""
+        score = provider._calculate_relevance_score(
+            "Python testing with pytest", "Fixtures and plugins for Python", "pytest fixtures"
+        )
+        # Title has "pytest" (0.3 * 1/2), snippet has "fixtures" (0.2 * 1/2)
+        assert score == pytest.approx(0.25)
+
+    def test_relevance_score_is_capped(self, provider):
+        """Test that exact matches in title and snippet are capped at 1.0."""
+        assert provider._calculate_relevance_score("docker", "docker", "docker") == 1.0
+
+
 class TestWebResearchComponentIntegration:
     """Test integration between web research components."""
     